@@ -0,0 +1,185 @@
+"""
+Approximate word counting in bounded memory.
+
+``CountMinSketch`` estimates the count of any word from a fixed table and
+``SpaceSaving`` keeps the most frequent words in a fixed number of
+counters.  ``ApproximateCounter`` feeds both and reports, for every word
+it keeps, the smaller of their two estimates.
+
+Error bounds, for a stream of N words:
+
+* Count-Min Sketch with ``width = ceil(e / epsilon)`` and
+  ``depth = ceil(ln(1 / delta))``: an estimate is never below the true
+  count and exceeds it by at most ``epsilon * N`` with probability at
+  least ``1 - delta``.
+* Space-Saving with ``capacity`` counters: every word occurring more
+  than ``N / capacity`` times is kept, and the count of a kept word
+  exceeds the true count by at most its recorded error, itself at most
+  ``N / capacity``.
+"""
+import hashlib
+import heapq
+import math
+from array import array
+
+DEFAULT_EPSILON = 1e-4
+DEFAULT_DELTA = 1e-3
+DEFAULT_CAPACITY = 1000
+
+
+def word_hashes(word):
+    """
+    Return two independent 64-bit hashes of a word.
+
+    Python's ``hash`` changes between processes, so a fixed digest is used
+    to give the same sketch in every run.
+    """
+    digest = hashlib.blake2b(word.encode('utf-8'), digest_size=16).digest()
+    return (int.from_bytes(digest[:8], 'little'),
+            int.from_bytes(digest[8:], 'little') | 1)
+
+
+class CountMinSketch:
+    """
+    Fixed-size table of counters that overestimates word counts.
+    """
+
+    def __init__(self, epsilon=DEFAULT_EPSILON, delta=DEFAULT_DELTA):
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.tables = [array('Q', bytes(8 * self.width))
+                       for _ in range(self.depth)]
+        self.total = 0
+
+    def _cells(self, word):
+        """
+        Return the column of ``word`` in every row (double hashing).
+        """
+        first, second = word_hashes(word)
+        return [(first + row * second) % self.width
+                for row in range(self.depth)]
+
+    def add(self, word, count=1):
+        """
+        Count ``word`` ``count`` times.
+        """
+        for table, cell in zip(self.tables, self._cells(word)):
+            table[cell] += count
+        self.total += count
+
+    def estimate(self, word):
+        """
+        Return an upper bound of the count of ``word``.
+        """
+        return min(table[cell]
+                   for table, cell in zip(self.tables, self._cells(word)))
+
+    def error_bound(self):
+        """
+        Return the overestimate not exceeded with probability 1 - delta.
+        """
+        return math.e / self.width * self.total
+
+
+class SpaceSaving:
+    """
+    Heavy-hitter counters for the most frequent words.
+
+    When all counters are in use, a new word takes over the counter of
+    the least counted word and inherits its count as error.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # (count, word) entries; an entry is stale once the count changed
+        self.heap = []
+        self.total = 0
+
+    def add(self, word, count=1):
+        """
+        Count ``word`` ``count`` times.
+        """
+        self.total += count
+        if word in self.counts:
+            self.counts[word] += count
+            return
+        error = 0
+        if len(self.counts) >= self.capacity:
+            error = self._evict()
+        self.counts[word] = error + count
+        self.errors[word] = error
+        heapq.heappush(self.heap, (self.counts[word], word))
+
+    def _evict(self):
+        """
+        Drop the least counted word and return its count.
+        """
+        while True:
+            count, word = heapq.heappop(self.heap)
+            current = self.counts[word]
+            if current == count:
+                del self.counts[word]
+                del self.errors[word]
+                return count
+            heapq.heappush(self.heap, (current, word))
+
+    def error_bound(self):
+        """
+        Return the largest possible overestimate of a kept count.
+        """
+        return self.total // self.capacity
+
+
+class ApproximateCounter:
+    """
+    Count-Min Sketch and Space-Saving fed with the same words.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, epsilon=DEFAULT_EPSILON,
+                 delta=DEFAULT_DELTA):
+        self.sketch = CountMinSketch(epsilon, delta)
+        self.heavy = SpaceSaving(capacity)
+
+    @property
+    def total(self):
+        """
+        Number of words counted.
+        """
+        return self.heavy.total
+
+    def update(self, word_counts):
+        """
+        Count the (word, count) pairs of a mapping, e.g. one chunk's Counter.
+        """
+        for word, count in word_counts.items():
+            self.sketch.add(word, count)
+            self.heavy.add(word, count)
+
+    def estimate(self, word):
+        """
+        Return an upper bound of the count of ``word``.
+        """
+        estimate = self.sketch.estimate(word)
+        if word in self.heavy.counts:
+            estimate = min(estimate, self.heavy.counts[word])
+        return estimate
+
+    def top(self, k):
+        """
+        Return up to ``k`` (word, estimated count) pairs, most frequent first.
+        """
+        return heapq.nlargest(
+            k, ((word, self.estimate(word)) for word in self.heavy.counts),
+            key=lambda item: item[1])
+
+    def describe_bounds(self):
+        """
+        Return a one-line description of the error bounds of this run.
+        """
+        return (f"Approximate counts: at most {self.heavy.error_bound()} "
+                f"too high (Space-Saving, {self.heavy.capacity} counters), "
+                f"and at most {self.sketch.error_bound():.1f} too high with "
+                f"probability {1 - math.exp(-self.sketch.depth):.4f} "
+                f"(Count-Min Sketch, {self.sketch.depth}x{self.sketch.width})")
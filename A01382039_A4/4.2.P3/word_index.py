@@ -0,0 +1,285 @@
+"""
+Persistent inverted index of word counts, stored in SQLite.
+
+Every indexed file has a row in ``files`` and one posting per distinct
+word: (word, file, count, optional line numbers).  Postings are keyed by
+(word, file) in a WITHOUT ROWID table, so a point lookup or a prefix query
+is a range scan of the primary key.  Line numbers are stored as a packed
+``array('I')``.
+
+A file is re-indexed only when it changed: equal size and modification
+time mean unchanged, and otherwise a SHA-256 of the content decides.  A
+file indexed without line numbers is also re-indexed when they are asked
+for.
+
+Usage: python word_index.py INDEX WORD [WORD ...] [--file PATH] [--prefix]
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import string
+from array import array
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    positions INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    word TEXT NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    count INTEGER NOT NULL,
+    lines BLOB,
+    PRIMARY KEY (word, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_file ON postings(file_id);
+"""
+
+
+def normalize(word):
+    """
+    Normalize a query word the way the word counter does.
+    """
+    return word.lower().strip(string.punctuation)
+
+
+def hash_file(file_path):
+    """
+    Return the SHA-256 hex digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_signature(file_path):
+    """
+    Return (size, mtime_ns, sha256) of a file.
+
+    Take it before counting, so that a file changed while it is counted
+    is not recorded as current.
+
+    Raises:
+        OSError: if the file cannot be read.
+    """
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns, hash_file(file_path)
+
+
+def prefix_upper_bound(prefix):
+    """
+    Return the smallest string greater than every string starting with
+    ``prefix``, or None if there is none.
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class WordIndex:
+    """
+    SQLite inverted index mapping word -> (file, count, line numbers).
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+        columns = [row[1] for row in
+                   self.connection.execute("PRAGMA table_info(files)")]
+        if "positions" not in columns:
+            # Index created before line numbers were tracked per file
+            with self.connection:
+                self.connection.execute(
+                    "ALTER TABLE files ADD COLUMN "
+                    "positions INTEGER NOT NULL DEFAULT 0")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self.connection.close()
+
+    def _file_row(self, file_path):
+        """
+        Return (id, size, mtime_ns, sha256, positions) of an indexed file,
+        or None.
+        """
+        return self.connection.execute(
+            "SELECT id, size, mtime_ns, sha256, positions FROM files "
+            "WHERE path = ?",
+            (os.path.abspath(file_path),)).fetchone()
+
+    def is_current(self, file_path, positions=False):
+        """
+        Return True if the index holds the current content of a file,
+        with line numbers if ``positions`` is true.
+
+        A file touched without changing its content gets its new size and
+        modification time recorded, so the next check is a plain stat.
+
+        Raises:
+            OSError: if the file cannot be read.
+        """
+        row = self._file_row(file_path)
+        if row is None:
+            return False
+        file_id, size, mtime_ns, sha256, has_positions = row
+        if positions and not has_positions:
+            return False
+        stat = os.stat(file_path)
+        if (stat.st_size, stat.st_mtime_ns) == (size, mtime_ns):
+            return True
+        if hash_file(file_path) != sha256:
+            return False
+        with self.connection:
+            self.connection.execute(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?",
+                (stat.st_size, stat.st_mtime_ns, file_id))
+        return True
+
+    def update_file(self, file_path, word_count, lines=None, signature=None):
+        """
+        Replace the postings of a file in one transaction.
+
+        Args:
+            file_path: the counted file.
+            word_count: mapping of word -> count.
+            lines: optional mapping of word -> sequence of line numbers.
+            signature: ``file_signature`` of the file taken before it was
+                counted; taken now if omitted.
+        """
+        path = os.path.abspath(file_path)
+        size, mtime_ns, sha256 = signature or file_signature(file_path)
+        positions = int(lines is not None)
+        with self.connection:
+            row = self._file_row(path)
+            if row is None:
+                file_id = self.connection.execute(
+                    "INSERT INTO files (path, size, mtime_ns, sha256, "
+                    "positions) VALUES (?, ?, ?, ?, ?)",
+                    (path, size, mtime_ns, sha256, positions)).lastrowid
+            else:
+                file_id = row[0]
+                self.connection.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ?, sha256 = ?, "
+                    "positions = ? WHERE id = ?",
+                    (size, mtime_ns, sha256, positions, file_id))
+                self.connection.execute(
+                    "DELETE FROM postings WHERE file_id = ?", (file_id,))
+            self.connection.executemany(
+                "INSERT INTO postings (word, file_id, count, lines) "
+                "VALUES (?, ?, ?, ?)",
+                ((word, file_id, count,
+                  array('I', lines[word]).tobytes() if lines else None)
+                 for word, count in word_count.items()))
+
+    def lookup(self, word):
+        """
+        Return the (file path, count) pairs of a word, most frequent first.
+        """
+        return self.connection.execute(
+            "SELECT files.path, postings.count FROM postings "
+            "JOIN files ON files.id = postings.file_id "
+            "WHERE postings.word = ? ORDER BY postings.count DESC, files.path",
+            (normalize(word),)).fetchall()
+
+    def count(self, word, file_path):
+        """
+        Return how often a word appears in a file (0 if never).
+        """
+        row = self.connection.execute(
+            "SELECT postings.count FROM postings "
+            "JOIN files ON files.id = postings.file_id "
+            "WHERE postings.word = ? AND files.path = ?",
+            (normalize(word), os.path.abspath(file_path))).fetchone()
+        return row[0] if row else 0
+
+    def lines(self, word, file_path):
+        """
+        Return the line numbers of a word in a file, or None if they were
+        not indexed.
+        """
+        row = self.connection.execute(
+            "SELECT postings.lines FROM postings "
+            "JOIN files ON files.id = postings.file_id "
+            "WHERE postings.word = ? AND files.path = ?",
+            (normalize(word), os.path.abspath(file_path))).fetchone()
+        if row is None or row[0] is None:
+            return None
+        line_numbers = array('I')
+        line_numbers.frombytes(row[0])
+        return line_numbers.tolist()
+
+    def prefix(self, prefix, limit=None):
+        """
+        Return (word, file path, count) rows of the words starting with
+        ``prefix``, in word order.
+        """
+        low = normalize(prefix)
+        high = prefix_upper_bound(low)
+        query = ("SELECT postings.word, files.path, postings.count "
+                 "FROM postings JOIN files ON files.id = postings.file_id "
+                 "WHERE postings.word >= ?")
+        params = [low]
+        if high is not None:
+            query += " AND postings.word < ?"
+            params.append(high)
+        query += " ORDER BY postings.word, files.path"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(query, params).fetchall()
+
+
+def main():
+    """
+    Query an index built with ``wordcount.py --index``.
+    """
+    parser = argparse.ArgumentParser(
+        description="Look up words in a word-count index.")
+    parser.add_argument("index", help="SQLite index file")
+    parser.add_argument("words", nargs="+", help="words to look up")
+    parser.add_argument("--file", help="only this file, with line numbers")
+    parser.add_argument("--prefix", action="store_true",
+                        help="treat the words as prefixes")
+    parser.add_argument("--limit", type=int,
+                        help="maximum rows per prefix")
+    args = parser.parse_args()
+    if not os.path.exists(args.index):
+        print(f"Error: Index '{args.index}' not found.")
+        return
+
+    with WordIndex(args.index) as index:
+        for word in args.words:
+            if args.prefix:
+                for match, path, count in index.prefix(word, args.limit):
+                    if args.file is None or path == os.path.abspath(args.file):
+                        print(f"{match}\t{path}\t{count}")
+            elif args.file:
+                lines = index.lines(word, args.file)
+                suffix = f"\tlines {lines}" if lines else ""
+                print(f"{word}\t{index.count(word, args.file)}{suffix}")
+            else:
+                for path, count in index.lookup(word):
+                    print(f"{word}\t{path}\t{count}")
+
+
+if __name__ == "__main__":
+    main()
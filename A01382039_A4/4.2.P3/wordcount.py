@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+"""
+Module to perform word frequency count on text files.
+
+Originally exported from the wordCount.ipynb notebook.  Importing the
+module only defines the functions; ``count_file`` and ``count_stream``
+return a ``Counter`` of the words of a file or an open text stream.
+
+Usage: python wordcount.py [file ...] [--quiet] [--top K] [--approximate]
+                           [--map-reduce] [--index DB [--positions]]
+"""
+import argparse
+import codecs
+import heapq
+import time
+import string
+import os
+import re
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
+from operator import itemgetter
+
+from approximate_counts import DEFAULT_CAPACITY, ApproximateCounter
+from word_index import WordIndex, file_signature
+
+# Characters read per chunk; memory is bounded by this and the vocabulary
+CHUNK_SIZE = 1 << 20
+# Files larger than this many bytes are split for the map phase
+SPLIT_SIZE = 1 << 24
+# Bytes that str.split() treats as whitespace; a split there is safe in UTF-8
+ASCII_WHITESPACE = re.compile(rb'[\t\n\x0b\x0c\r\x1c-\x1f ]')
+
+def word_aligned(chunks):
+    """
+    Regroup text chunks into pieces that end between words.
+
+    A word cut by the end of a chunk is held back and joined with the
+    next chunk, so splitting every piece gives the same words as
+    splitting the concatenated chunks.
+    """
+    pending = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        text = pending + chunk
+        if text[-1].isspace():
+            pending = ''
+            yield text
+            continue
+        # The last word may continue in the next chunk
+        parts = text.rsplit(None, 1)
+        pending = parts.pop()
+        if parts:
+            yield parts[0]
+    if pending:
+        yield pending
+
+# Assume the file is in the current working directory or a full path is provided
+def read_chunks(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Yield the text of the given file in pieces that end between words.
+
+    The file is read in chunks of ``chunk_size`` characters, so splitting
+    every piece gives the words of ``file.read().split()``.
+    """
+    try:
+        file = open(file_path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        print(f"Error: File '{file_path}' not found.")
+        return
+    with file:
+        yield from word_aligned(iter(partial(file.read, chunk_size), ''))
+
+def iter_decoded(file, size, chunk_size=CHUNK_SIZE):
+    """
+    Yield the next ``size`` bytes of a binary file as UTF-8 text chunks.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while size > 0:
+        data = file.read(min(chunk_size, size))
+        if not data:
+            break
+        size -= len(data)
+        yield decoder.decode(data)
+    yield decoder.decode(b'', final=True)
+
+def read_range_chunks(file_path, start, end, chunk_size=CHUNK_SIZE):
+    """
+    Yield the text of ``file[start:end]`` in pieces that end between words.
+
+    ``start`` and ``end`` must fall between words, see ``split_word_ranges``.
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        yield from word_aligned(iter_decoded(file, end - start, chunk_size))
+
+def split_word_ranges(file_path, parts):
+    """
+    Split a file into at most ``parts`` byte ranges that start between words.
+
+    Every range but the first starts at an ASCII whitespace byte, which
+    is never inside a UTF-8 character.
+
+    Returns:
+        list: (start, end) pairs covering the whole file in order.
+    """
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as file:
+        for i in range(1, parts):
+            position = max(size * i // parts, bounds[-1] + 1)
+            file.seek(position)
+            while True:
+                block = file.read(CHUNK_SIZE)
+                match = ASCII_WHITESPACE.search(block)
+                if match or not block:
+                    break
+                position += len(block)
+            if not match:
+                break
+            position += match.start()
+            if position >= size:
+                break
+            bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def process_file(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Yield the words of the given text file.
+    """
+    for text in read_chunks(file_path, chunk_size):
+        yield from text.split()
+
+def count_words(words):
+    """
+    Count the frequency of each word in the given iterable of words.
+
+    Words are counted as they arrive, so a generator is never materialized.
+    """
+    word_count = Counter()
+    for word in words:
+        word = word.strip(string.punctuation).lower()
+        if word:
+            word_count[word] += 1
+    return word_count
+
+def count_chunks(chunks):
+    """
+    Count words like ``count_words``, a whole piece of text at a time.
+
+    Each piece is lowercased in one call and its words are stripped,
+    filtered and counted by ``map``, ``filter`` and ``Counter.update``
+    without a Python-level loop per word.  Lowercasing before stripping
+    gives the same words, since no letter lowercases to punctuation.
+    """
+    word_count = Counter()
+    for text in chunks:
+        word_count.update(filter(None, map(
+            str.strip, text.lower().split(), repeat(string.punctuation))))
+    return word_count
+
+def count_stream(stream, chunk_size=CHUNK_SIZE):
+    """
+    Return a Counter of the words of an open text stream.
+
+    Words are stripped of punctuation and lowercased; the stream is read
+    in chunks of ``chunk_size`` characters.
+    """
+    return count_chunks(word_aligned(iter(partial(stream.read, chunk_size), '')))
+
+def count_file(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Return a Counter of the words of a UTF-8 text file.
+
+    Raises:
+        OSError: if the file cannot be opened.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return count_stream(file, chunk_size)
+
+def count_lines(file_path):
+    """
+    Count the words of a file and record the lines they appear on.
+
+    Returns:
+        tuple: (Counter of the words, {word: array('I') of line numbers,
+        one entry per occurrence})
+    """
+    lines = {}
+    punctuation = string.punctuation
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line_num, line in enumerate(file, start=1):
+            for word in filter(None, map(str.strip, line.lower().split(),
+                                         repeat(punctuation))):
+                occurrences = lines.get(word)
+                if occurrences is None:
+                    occurrences = lines[word] = array('I')
+                occurrences.append(line_num)
+    return Counter({word: len(found) for word, found in lines.items()}), lines
+
+def count_range(task):
+    """
+    Map phase: count the words of one (file path, start, end) byte range.
+    """
+    file_path, start, end = task
+    return count_chunks(read_range_chunks(file_path, start, end))
+
+def plan_tasks(file_paths, split_size=SPLIT_SIZE):
+    """
+    Split every file into byte ranges of about ``split_size`` bytes.
+
+    Files that cannot be found are reported and left out.
+
+    Returns:
+        list: (file path, start, end) tasks, in file order.
+    """
+    tasks = []
+    for file_path in file_paths:
+        try:
+            size = os.path.getsize(file_path)
+        except FileNotFoundError:
+            print(f"Error: File '{file_path}' not found.")
+            continue
+        parts = max(1, -(-size // split_size))
+        tasks.extend((file_path, start, end)
+                     for start, end in split_word_ranges(file_path, parts))
+    return tasks
+
+def count_files_parallel(file_paths, workers=None, split_size=SPLIT_SIZE):
+    """
+    Count the words of several files with a map-reduce over a process pool.
+
+    Large files are split into byte ranges and small files are whole
+    tasks, so all of them are spread over the workers.  The partial
+    counts of a file are merged in range order, which keeps the
+    first-seen word order of ``count_chunks``.
+
+    Returns:
+        tuple: ({file path: Counter}, {phase: seconds})
+    """
+    timings = {}
+    start_time = time.perf_counter()
+    tasks = plan_tasks(file_paths, split_size)
+    timings["split"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partial_counts = list(executor.map(count_range, tasks))
+    timings["map"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    word_counts = {}
+    for (file_path, _, _), counts in zip(tasks, partial_counts):
+        word_counts.setdefault(file_path, Counter()).update(counts)
+    timings["reduce"] = time.perf_counter() - start_time
+    return word_counts, timings
+
+def benchmark_normalization(file_paths, rounds=5):
+    """
+    Print the words per second of ``count_words`` and ``count_chunks``.
+    """
+    for file_path in file_paths:
+        timings = {}
+        for name, count in (
+                ("per word", lambda: count_words(process_file(file_path))),
+                ("per chunk", lambda: count_chunks(read_chunks(file_path)))):
+            best = float("inf")
+            for _ in range(rounds):
+                start_time = time.perf_counter()
+                count()
+                best = min(best, time.perf_counter() - start_time)
+            timings[name] = best
+        words = sum(1 for _ in process_file(file_path))
+        line = f"{os.path.basename(file_path)}: {words} words"
+        for name, best in timings.items():
+            line += f", {name} {words / best:,.0f} words/s"
+        print(line + f" (x{timings['per word'] / timings['per chunk']:.1f})")
+
+def top_words(word_count, k):
+    """
+    Return the ``k`` most frequent words as a dict, most frequent first.
+
+    A heap selects them without sorting the whole vocabulary; ties keep
+    first-seen order.
+    """
+    return dict(heapq.nlargest(k, word_count.items(), key=itemgetter(1)))
+
+def count_approximate(chunks, capacity=DEFAULT_CAPACITY):
+    """
+    Count words in bounded memory, see ``approximate_counts``.
+
+    Each piece of text is counted exactly first, so the sketches receive
+    one weighted update per distinct word of the piece.
+    """
+    counter = ApproximateCounter(capacity)
+    for text in chunks:
+        counter.update(count_chunks([text]))
+    return counter
+
+def print_results(word_count, elapsed_time, notes=(), show_words=True,
+                  total_count=None):
+    """
+    Print the word frequency count and total count, then any notes.
+
+    The word lines are written with a single buffered write, and left
+    out when ``show_words`` is false.  ``total_count`` is the number of
+    words in the file when ``word_count`` lists only some of them.
+    """
+    if show_words:
+        sys.stdout.write("Word Frequency Count:\n" + "".join(
+            f"{word}: {count}\n" for word, count in word_count.items()))
+    if total_count is None:
+        total_count = sum(word_count.values())
+
+    print("\nTotal Count:", total_count)
+    print("Time Elapsed:", elapsed_time, "seconds")
+    for note in notes:
+        print(note)
+
+def save_results(word_count, elapsed_time, notes=()):
+    """
+    Save the word frequency count, elapsed time and notes to a file.
+    """
+    with open('WordCountResults.txt', 'w', encoding='utf-8') as result_file:
+        result_file.write("Word Frequency Count:\n")
+        result_file.writelines(
+            f"{word}: {count}\n" for word, count in word_count.items())
+        result_file.write("\nTime Elapsed: " + str(elapsed_time) + " seconds\n")
+        for note in notes:
+            result_file.write(note + "\n")
+
+def main(file_name, top=None, approximate=False, capacity=DEFAULT_CAPACITY,
+         show_words=True, index=None, positions=False):
+    """
+    Main function to perform word frequency count.
+
+    With ``top`` only the most frequent words are listed, most frequent
+    first.  ``approximate`` counts with a Count-Min Sketch and
+    Space-Saving in bounded memory instead of an exact table.  Without
+    ``show_words`` the words are saved but not printed.  The exact counts
+    are also stored in ``index``, a ``WordIndex``, unless it is up to date;
+    with ``positions`` the line of every word is stored too.
+    """
+    # Check if file_name is a path or just a filename
+    if not os.path.isabs(file_name):
+        # If just a filename, construct a path assuming it's in the current working directory
+        file_path = os.path.join(os.getcwd(), file_name)
+    else:
+        # If an absolute path, use it directly
+        file_path = file_name
+
+    start_time = time.time()
+
+    notes = []
+    if approximate:
+        counter = count_approximate(read_chunks(file_path), capacity)
+        total_count = counter.total
+        word_count = dict(counter.top(top or capacity))
+        notes.append(counter.describe_bounds())
+    else:
+        try:
+            if index is not None \
+                    and not index.is_current(file_path, positions):
+                signature = file_signature(file_path)
+                if positions:
+                    word_count, lines = count_lines(file_path)
+                else:
+                    word_count, lines = count_file(file_path), None
+                index.update_file(file_path, word_count, lines, signature)
+            else:
+                word_count = count_file(file_path)
+        except FileNotFoundError:
+            print(f"Error: File '{file_path}' not found.")
+            return
+        total_count = sum(word_count.values())
+        if top:
+            word_count = top_words(word_count, top)
+    if not word_count:
+        return
+
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+
+    print_results(word_count, elapsed_time, notes, show_words, total_count)
+    save_results(word_count, elapsed_time, notes)
+
+def main_parallel(file_names, workers=None, top=None, show_words=True,
+                  index=None):
+    """
+    Word frequency count of several files as one map-reduce run.
+
+    Results are printed and saved file by file as ``main`` does, with the
+    elapsed time of the whole run, followed by the time of each phase.
+    Files that changed are stored in ``index`` if one is given.
+    """
+    start_time = time.time()
+    file_paths = [os.path.join(os.getcwd(), file_name)
+                  for file_name in file_names]
+    signatures = {}
+    if index is not None:
+        for file_path in file_paths:
+            try:
+                if not index.is_current(file_path):
+                    signatures[file_path] = file_signature(file_path)
+            except OSError:
+                pass
+    word_counts, timings = count_files_parallel(file_paths, workers)
+    elapsed_time = time.time() - start_time
+
+    for file_path in file_paths:
+        word_count = word_counts.get(file_path)
+        if word_count:
+            if file_path in signatures:
+                index.update_file(file_path, word_count,
+                                  signature=signatures[file_path])
+            total_count = sum(word_count.values())
+            if top:
+                word_count = top_words(word_count, top)
+            print_results(word_count, elapsed_time, show_words=show_words,
+                          total_count=total_count)
+            save_results(word_count, elapsed_time)
+    print("Phase Times:", ", ".join(
+        f"{phase} {seconds:.6f} s" for phase, seconds in timings.items()))
+
+def cli():
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(
+        description="Word frequency count of text files.")
+    parser.add_argument("file_names", nargs="*",
+                        default=[f"TC{i}.txt" for i in range(1, 6)],
+                        help="files to count (default: TC1.txt to TC5.txt)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="print only the totals, not every word")
+    parser.add_argument("--map-reduce", action="store_true",
+                        help="count all files at once in a process pool")
+    parser.add_argument("--workers", type=int,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--top", type=int, metavar="K",
+                        help="list only the K most frequent words")
+    parser.add_argument("--approximate", action="store_true",
+                        help="count in bounded memory with a Count-Min "
+                             "Sketch and Space-Saving")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY,
+                        help="words tracked in --approximate mode "
+                             "(default: %(default)s)")
+    parser.add_argument("--index", metavar="DB",
+                        help="also store the counts in this SQLite index, "
+                             "see word_index.py")
+    parser.add_argument("--positions", action="store_true",
+                        help="store the line numbers of every word in "
+                             "the index")
+    args = parser.parse_args()
+    if args.approximate and args.map_reduce:
+        parser.error("--approximate cannot be combined with --map-reduce")
+    if args.index and args.approximate:
+        parser.error("--index needs exact counts, not --approximate")
+    if args.positions and (not args.index or args.map_reduce):
+        parser.error("--positions requires --index without --map-reduce")
+
+    index = WordIndex(args.index) if args.index else None
+    try:
+        if args.map_reduce:
+            main_parallel(args.file_names, args.workers, args.top,
+                          not args.quiet, index)
+            return
+        for file_name in args.file_names:
+            main(file_name, args.top, args.approximate, args.capacity,
+                 not args.quiet, index, args.positions)
+    finally:
+        if index is not None:
+            index.close()
+
+if __name__ == "__main__":
+    cli()
+
+# pylint: disable=C0304
\ No newline at end of file
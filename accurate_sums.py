@@ -0,0 +1,65 @@
+"""
+Accurate mean and variance for values of extreme magnitude.
+
+``math.fsum`` returns correctly rounded sums, so large values cannot
+swamp small ones.  Deviations from the mean are scaled by their largest
+magnitude before they are squared when the squares could overflow, and
+the loops run through ``map`` to stay fast.
+"""
+import math
+import sys
+from itertools import repeat
+from operator import mul, sub, truediv
+
+
+def accurate_mean(data):
+    """
+    Return the mean of a sequence using a correctly rounded sum.
+    """
+    if not len(data):
+        return None
+    try:
+        return math.fsum(data) / len(data)
+    except OverflowError:
+        # The total exceeds the float range; divide each value first
+        return math.fsum(map(truediv, data, repeat(len(data))))
+    except ValueError:
+        # Both inf and -inf are present: the mean is undefined
+        return math.nan
+
+
+def accurate_moments(data, mean=None):
+    """
+    Return (count, mean, M2), where M2 is the sum of squared deviations.
+
+    Uses the corrected two-pass algorithm: the sum of the deviations, which
+    is zero in exact arithmetic, removes any error left in ``mean``.  The
+    mean is computed with ``math.fsum`` unless it is given.
+    """
+    n = len(data)
+    if not n:
+        return 0, 0.0, 0.0
+    if mean is None:
+        mean = accurate_mean(data)
+    deviations = list(map(sub, data, repeat(mean)))
+    scale = max(map(abs, deviations))
+    if not scale:
+        return n, mean, 0.0
+    if math.isinf(scale):
+        return n, mean, math.inf
+    if scale * scale * n < sys.float_info.max:
+        # The squares cannot overflow: skip the scaling pass
+        m2 = math.fsum(map(mul, deviations, deviations)) \
+            - math.fsum(deviations) ** 2 / n
+        return n, mean, m2
+    scaled = list(map(truediv, deviations, repeat(scale)))
+    m2 = math.fsum(map(mul, scaled, scaled)) - math.fsum(scaled) ** 2 / n
+    return n, mean, m2 * scale * scale
+
+
+def accurate_variance(data, mean=None):
+    """
+    Return the population variance of a sequence, or None if it is empty.
+    """
+    n, _, m2 = accurate_moments(data, mean)
+    return m2 / n if n else None
@@ -0,0 +1,279 @@
+"""
+Benchmarks for the number-processing tools on the TC1-TC7 inputs.
+
+Usage: python benchmarks.py <benchmark> [directory]
+"""
+import os
+import sys
+import time
+from fractions import Fraction
+
+import fixed_width
+import numpy_backend
+from accurate_sums import accurate_moments
+from convert_numbers import convert_numbers
+from frequency_table import FrequencyTable
+from numeric_parser import SLICE_LINES, parse_numeric_file
+from streaming_statistics import RunningStatistics
+
+TC_FILES = [f"TC{i}.txt" for i in range(1, 8)]
+# Directory of the word counter, which is not a package
+WORDCOUNT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "A01382039_A4", "4.2.P3")
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark function under ``name``.
+    """
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def best_time(func, *args, repeat=3):
+    """
+    Return the best wall-clock time of ``repeat`` calls and the last result.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+def load_numbers(file_path):
+    """
+    Read the numbers of a TC file, silently skipping invalid lines.
+    """
+    return parse_numeric_file(file_path)[0]
+
+
+def line_by_line_numbers(file_path):
+    """
+    Read a numeric file the way the scripts did before numeric_parser.
+    """
+    data = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                data.append(float(line.strip()))
+            except ValueError:
+                pass
+    return data
+
+
+def tc_paths(directory):
+    """
+    Return the TC files present in ``directory``.
+    """
+    paths = [os.path.join(directory, name) for name in TC_FILES]
+    return [path for path in paths if os.path.exists(path)]
+
+
+def quadratic_mode(data):
+    """
+    Mode as computed before FrequencyTable: max() inside the comprehension.
+    """
+    frequency = {}
+    for num in data:
+        frequency[num] = frequency.get(num, 0) + 1
+    mode = [k for k, v in frequency.items() if v == max(frequency.values())]
+    return mode[0] if mode else None
+
+
+@benchmark("mode")
+def bench_mode(directory):
+    """
+    Compare the quadratic mode with the Counter and run-length tables.
+    """
+    print(f"{'File':<8}{'Count':>8}{'Distinct':>10}{'Quadratic':>12}"
+          f"{'Counter':>12}{'RunLength':>12}{'Speedup':>10}")
+    for path in tc_paths(directory):
+        data = load_numbers(path)
+        sorted_data = sorted(data)
+        old_time, old_mode = best_time(quadratic_mode, data, repeat=1)
+        new_time, table = best_time(FrequencyTable.from_values, data)
+        run_time, _ = best_time(FrequencyTable.from_sorted, sorted_data)
+        assert table.mode() == old_mode
+        print(f"{os.path.basename(path):<8}{len(data):>8}"
+              f"{len(table.counts):>10}{old_time:>12.6f}{new_time:>12.6f}"
+              f"{run_time:>12.6f}{old_time / new_time:>9.1f}x")
+
+
+@benchmark("parse")
+def bench_parse(directory):
+    """
+    Compare line-by-line float() parsing with the bulk chunk parser.
+    """
+    print(f"{'File':<8}{'Bytes':>10}{'PerLine':>12}{'Bulk':>12}{'Speedup':>10}")
+    for path in tc_paths(directory):
+        old_time, old_values = best_time(line_by_line_numbers, path)
+        new_time, new_values = best_time(load_numbers, path)
+        assert list(new_values) == old_values
+        print(f"{os.path.basename(path):<8}{os.path.getsize(path):>10}"
+              f"{old_time:>12.6f}{new_time:>12.6f}"
+              f"{old_time / new_time:>9.1f}x")
+
+
+def naive_mean_variance(data):
+    """
+    Mean and variance as computed before accurate_sums.
+    """
+    mean = sum(data) / len(data)
+    return mean, sum((x - mean) ** 2 for x in data) / len(data)
+
+
+def welford_mean_variance(data):
+    """
+    Mean and variance from per-value Welford updates.
+    """
+    stats = RunningStatistics()
+    for value in data:
+        stats.update(value)
+    return stats.mean, stats.variance()
+
+
+def merged_mean_variance(data, chunks=4):
+    """
+    Mean and variance the way the default engine reaches them: blocks fed
+    to ``update_many`` and the partial aggregates of chunks merged.
+    """
+    stats = RunningStatistics()
+    step = -(-len(data) // chunks) or 1
+    for start in range(0, len(data), step):
+        partial_stats = RunningStatistics()
+        for block in range(start, min(start + step, len(data)), SLICE_LINES):
+            partial_stats.update_many(
+                data[block:min(block + SLICE_LINES, start + step)])
+        stats.merge(partial_stats)
+    return stats.mean, stats.variance()
+
+
+def compensated_mean_variance(data):
+    """
+    Mean and variance from fsum and the scaled corrected two-pass method.
+    """
+    n, mean, m2 = accurate_moments(data)
+    return mean, m2 / n
+
+
+def numpy_mean_variance(data):
+    """
+    Mean and variance from the NumPy backend.
+    """
+    results = numpy_backend.compute_statistics(
+        numpy_backend.np.frombuffer(data, dtype=numpy_backend.np.float64))
+    return results[0], results[4]
+
+
+def exact_mean_variance(data):
+    """
+    Mean and variance in exact rational arithmetic, used as the reference.
+    """
+    values = [Fraction(x) for x in data]
+    mean = sum(values) / len(values)
+    return mean, sum((x - mean) ** 2 for x in values) / len(values)
+
+
+def relative_error(value, exact):
+    """
+    Return |value - exact| / |exact|, or the absolute error if exact is 0.
+    """
+    error = abs(Fraction(value) - exact)
+    return float(error / abs(exact)) if exact else float(error)
+
+
+@benchmark("summation")
+def bench_summation(directory):
+    """
+    Compare time and accuracy of the mean/variance implementations.
+    """
+    methods = [("naive", naive_mean_variance),
+               ("welford", welford_mean_variance),
+               ("merged", merged_mean_variance),
+               ("compensated", compensated_mean_variance)]
+    if numpy_backend.HAVE_NUMPY:
+        methods.append(("numpy", numpy_mean_variance))
+    print(f"{'File':<8}{'Method':<13}{'Time':>10}{'MeanRelErr':>13}"
+          f"{'VarRelErr':>13}")
+    for path in tc_paths(directory):
+        data = load_numbers(path)
+        exact_mean, exact_variance = exact_mean_variance(data)
+        for name, method in methods:
+            elapsed, (mean, variance) = best_time(method, data)
+            print(f"{os.path.basename(path):<8}{name:<13}{elapsed:>10.6f}"
+                  f"{relative_error(mean, exact_mean):>13.2e}"
+                  f"{relative_error(variance, exact_variance):>13.2e}")
+
+
+def legacy_conversion_text(data):
+    """
+    Binary and hexadecimal text as produced by convert_numbers.
+    """
+    binary_results, hexadecimal_results = convert_numbers(data)
+    return "\n".join(binary_results), "\n".join(hexadecimal_results)
+
+
+@benchmark("conversion")
+def bench_conversion(directory, width=64):
+    """
+    Compare convert_numbers with the fixed-width conversion engine.
+    """
+    if numpy_backend.HAVE_NUMPY:
+        # Batches in which no value is accepted must not break the NumPy path
+        for batch in ([], [1.5], [-1e30, float("inf")]):
+            assert fixed_width.convert_fixed_width(batch, width) \
+                == fixed_width._convert_python(batch, width)
+    print(f"{'File':<8}{'Count':>8}{'Rejected':>10}{'Legacy':>12}"
+          f"{'FixedPy':>12}{'FixedNumPy':>12}{'Speedup':>10}")
+    for path in tc_paths(directory):
+        data = load_numbers(path)
+        integral = [x for x in data
+                    if x.is_integer() and -2 ** 63 <= x < 2 ** 64]
+        legacy_time, _ = best_time(legacy_conversion_text, integral)
+        python_time, python_result = best_time(
+            fixed_width._convert_python, data, width)
+        rejected = python_result[2]
+        if numpy_backend.HAVE_NUMPY:
+            array = numpy_backend.np.frombuffer(data, dtype="float64")
+            numpy_time, numpy_result = best_time(
+                fixed_width._convert_numpy, array, width)
+            assert numpy_result[:2] == python_result[:2]
+            speedup = f"{legacy_time / numpy_time:>9.1f}x"
+        else:
+            numpy_time, speedup = float("nan"), f"{'n/a':>10}"
+        print(f"{os.path.basename(path):<8}{len(data):>8}"
+              f"{len(rejected):>10}{legacy_time:>12.6f}"
+              f"{python_time:>12.6f}{numpy_time:>12.6f}{speedup}")
+
+
+@benchmark("wordcount")
+def bench_wordcount(directory):
+    """
+    Compare per-word and per-chunk word normalization in words per second.
+    """
+    sys.path.insert(0, WORDCOUNT_DIR)
+    import wordcount  # pylint: disable=import-outside-toplevel
+    wordcount.benchmark_normalization(tc_paths(directory))
+
+
+def main():
+    """
+    Run the benchmark named on the command line.
+    """
+    if len(sys.argv) not in (2, 3) or sys.argv[1] not in BENCHMARKS:
+        print("Usage: python benchmarks.py <benchmark> [directory]")
+        print("Benchmarks: " + ", ".join(sorted(BENCHMARKS)))
+        return
+
+    directory = sys.argv[2] if len(sys.argv) == 3 else "."
+    BENCHMARKS[sys.argv[1]](directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Helpers shared by the on-disk caches and state files.
+"""
+import hashlib
+import json
+import os
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(file_path):
+    """
+    Return the SHA-256 hex digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(file_path, data):
+    """
+    Write ``data`` as JSON through a temporary file, so a reader never
+    sees a half-written file.
+    """
+    temp_file = file_path + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(temp_file, file_path)
+
+
+def hit_rate_summary(label, hits, misses):
+    """
+    Return a one-line description of hit and miss counters.
+    """
+    total = hits + misses
+    rate = hits / total * 100 if total else 0.0
+    return f"{label} hits: {hits}, misses: {misses} ({rate:.1f}% hit rate)"
@@ -0,0 +1,133 @@
+"""
+Catalogue index for matching sale products to catalogue titles.
+
+``compute_total_cost`` prices a sale with the first catalogue product, in
+catalogue order, whose title has a ``SequenceMatcher`` ratio of at least
+0.9 with the sale's product name.  ``CatalogueIndex`` returns the same
+product while computing the ratio for only a few titles:
+
+1. Titles equal to the name ignoring case are found in a dict.  The first
+   of them with a passing ratio ends the search; only earlier titles can
+   still take precedence.
+2. Earlier titles are shortlisted with bounds that a passing ratio must
+   satisfy, so no match is lost:
+
+   * length: ratio = 2M / (la + lb) with M <= min(la, lb) matched
+     characters;
+   * characters: M is at most the size of the intersection of the two
+     character multisets;
+   * trigrams: the matching blocks keep every trigram of the name that
+     neither contains an unmatched character (at most 3 per unmatched
+     character of the name) nor straddles two blocks (at most 2 per gap,
+     and every gap holds an unmatched character of the title), so at
+     least (la - 2) - 3(la - M) - 2(lb - M) trigrams of the name occur in
+     the title.  Shared trigrams are counted through an inverted index.
+
+3. The full ratio is computed for the shortlisted titles in catalogue
+   order.
+"""
+from collections import Counter
+from difflib import SequenceMatcher
+
+THRESHOLD = 0.9
+
+
+def trigrams(text):
+    """
+    Return the multiset of the three-character substrings of ``text``.
+    """
+    return Counter(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def min_matches(total_length, threshold=THRESHOLD):
+    """
+    Return the fewest matched characters M with 2M / total >= threshold.
+
+    The comparison is done in floating point exactly as
+    ``SequenceMatcher.ratio`` does it.
+    """
+    if not total_length:
+        return 0
+    matches = max(0, int(threshold * total_length / 2) - 1)
+    while 2.0 * matches / total_length < threshold:
+        matches += 1
+    return matches
+
+
+class CatalogueIndex:
+    """
+    Read-only lookup structures over a list of catalogue products.
+    """
+
+    def __init__(self, catalogue, threshold=THRESHOLD):
+        self.catalogue = catalogue
+        self.threshold = threshold
+        self.titles = [product["title"] for product in catalogue]
+        self.lengths = [len(title) for title in self.titles]
+        self.characters = [Counter(title) for title in self.titles]
+        # Lowercase title -> catalogue positions, in catalogue order
+        self.exact = {}
+        # Trigram -> [(catalogue position, occurrences in the title)]
+        self.trigram_postings = {}
+        for position, title in enumerate(self.titles):
+            self.exact.setdefault(title.lower(), []).append(position)
+            for gram, count in trigrams(title).items():
+                self.trigram_postings.setdefault(gram, []).append(
+                    (position, count))
+
+    def ratio(self, name, position):
+        """
+        Return the similarity ratio of ``name`` and a catalogue title.
+        """
+        return SequenceMatcher(None, name, self.titles[position]).ratio()
+
+    def find_similar_position(self, name):
+        """
+        Return the position of the first title with a passing ratio, or
+        None if there is none.
+        """
+        end = len(self.titles)
+        for position in self.exact.get(name.lower(), ()):
+            if self.ratio(name, position) >= self.threshold:
+                end = position
+                break
+
+        length = len(name)
+        characters = Counter(name)
+        shared = Counter()
+        for gram, count in trigrams(name).items():
+            for position, title_count in self.trigram_postings.get(gram, ()):
+                if position < end:
+                    shared[position] += min(count, title_count)
+
+        for position in range(end):
+            title_length = self.lengths[position]
+            matches = min_matches(length + title_length, self.threshold)
+            if matches > min(length, title_length):
+                continue
+            needed = (length - 2) - 3 * (length - matches) \
+                - 2 * (title_length - matches)
+            if needed > 0 and shared[position] < needed:
+                continue
+            if sum((characters & self.characters[position]).values()) \
+                    < matches:
+                continue
+            if self.ratio(name, position) >= self.threshold:
+                return position
+        return None if end == len(self.titles) else end
+
+    def find_similar(self, name):
+        """
+        Return the first catalogue product whose title is similar to
+        ``name``, or None.
+        """
+        position = self.find_similar_position(name)
+        return None if position is None else self.catalogue[position]
+
+    def find_exact(self, name):
+        """
+        Return the first catalogue product whose title equals ``name``
+        ignoring case, or None.
+        """
+        positions = self.exact.get(name.lower())
+        return self.catalogue[positions[0]] if positions else None
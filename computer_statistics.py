@@ -1,56 +1,43 @@
 """
 Read the file and provide statistic information from it.
 """
-import sys
+import argparse
+import glob
+import os
 import time
 import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 
-# Set working directory
-DIR = r"C:\Users\Sebastian\Downloads\P1\TC2.txt"
-sys.argv = ['statistics_results.py', DIR]
+import numpy_backend
+from accurate_sums import accurate_mean, accurate_variance
+from frequency_table import FrequencyTable
+from incremental_statistics import analyze_file_incremental
+from numeric_parser import (
+    ParseReport,
+    iter_blocks,
+    parse_numeric_file,
+    split_byte_ranges,
+)
+from result_cache import DEFAULT_CACHE_FILE, DEFAULT_CACHE_SIZE, ResultCache
+from streaming_statistics import DEFAULT_EXACT_LIMIT, StatisticsAccumulator
 
-def read_file(file_path):
-    """
-    Read the file and return a list of numbers.
-    """
-    data = []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            # pylint: disable=W1514
-            for line_num, line in enumerate(file, start=1):
-                try:
-                    number = float(line.strip())
-                    data.append(number)
-                except ValueError:
-                    print(f"Warning: Invalid data at line {line_num}: '{line}'")
-
-    except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.")
-        return []
-    except PermissionError:
-        print(f"Error: Permission denied for file '{file_path}'.")
-        return []
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return []
-
-    return data
+# Rows of the batch results table: label and index in the results tuple
+BATCH_ROWS = (("MEAN", 0), ("MEDIAN", 1), ("MODE", 2), ("SD", 3),
+              ("VARIANCE", 4))
 
 def compute_descriptive_statistics(data):
     """
     Compute descriptive statistics and return the results.
     """
-    mean = sum(data) / len(data) if data else None
+    mean = accurate_mean(data)
     sorted_data = sorted(data)
     n = len(sorted_data)
     median = (sorted_data[n // 2 - 1] + sorted_data[n // 2]) \
         / 2 if n % 2 == 0 else sorted_data[n // 2]
-    frequency = {}
-    for num in data:
-        frequency[num] = frequency.get(num, 0) + 1
-    mode = [k for k, v in frequency.items() if v == max(frequency.values())]
-    mode = mode[0] if mode else None
-    variance = sum((x - mean) ** 2 for x in data) / len(data) if data else None
+    mode = FrequencyTable.from_values(data).mode()
+    variance = accurate_variance(data, mean)
     standard_deviation = math.sqrt(variance) if variance is not None else None
     return mean, median, mode, standard_deviation, variance
 
@@ -78,25 +65,285 @@ def print_and_save_results(results, elapsed_time):
         result_file.write(f"Variance: {variance}\n")
         result_file.write(f"Time Elapsed: {elapsed_time} seconds\n")
 
+def analyze_file(file_path, backend="python", exact=False,
+                 exact_limit=DEFAULT_EXACT_LIMIT):
+    """
+    Read a file and compute its statistics with the selected engine.
+
+    Returns:
+        tuple: (results, ParseReport), where results is None if the file
+        holds no valid number.
+    """
+    if backend == "numpy":
+        array, report = numpy_backend.read_array(file_path)
+        results = numpy_backend.compute_statistics(array) \
+            if array.size else None
+    elif exact:
+        data, report = parse_numeric_file(file_path)
+        results = compute_descriptive_statistics(data) if data else None
+    else:
+        accumulator, report = reduce_byte_range(file_path, 0, None,
+                                                exact_limit)
+        results = accumulator.results() if report.values else None
+    return results, report
+
+def reduce_byte_range(file_path, start, end, exact_limit):
+    """
+    Parse the bytes ``[start, end)`` of a file into partial aggregates.
+
+    Returns:
+        tuple: (StatisticsAccumulator, ParseReport with chunk-local line
+        numbers)
+    """
+    report = ParseReport(file_path)
+    accumulator = StatisticsAccumulator(exact_limit)
+    for block in iter_blocks(file_path, report, start=start, end=end):
+        accumulator.update_many(block)
+    return accumulator, report
+
+def analyze_file_chunked(file_path, chunks, workers=None,
+                         exact_limit=DEFAULT_EXACT_LIMIT):
+    """
+    Reduce newline-aligned byte ranges of one file in parallel and merge
+    the partial aggregates.
+
+    Returns:
+        tuple: (results, ParseReport), like ``analyze_file``.
+    """
+    try:
+        ranges = split_byte_ranges(file_path, chunks)
+    except OSError:
+        return analyze_file(file_path, exact_limit=exact_limit)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = list(executor.map(
+            reduce_byte_range, repeat(file_path),
+            [start for start, _ in ranges], [end for _, end in ranges],
+            repeat(exact_limit)))
+
+    accumulator = StatisticsAccumulator(exact_limit)
+    report = ParseReport(file_path)
+    for chunk_accumulator, chunk_report in partials:
+        # Each chunk numbers its lines from 1; shift by the lines before it
+        report.merge(chunk_report, line_offset=report.lines)
+        accumulator.merge(chunk_accumulator)
+    results = accumulator.results() if report.values else None
+    return results, report
+
+def analyze_file_timed(file_path, options):
+    """
+    Run ``analyze_file`` and also return how long it took.
+    """
+    start_time = time.perf_counter()
+    results, report = analyze_file(file_path, **options)
+    return results, report, time.perf_counter() - start_time
+
+def cached_analysis(cache, file_path, options, analyze):
+    """
+    Return ``analyze()`` for a file, served from ``cache`` when possible.
+
+    Returns:
+        tuple: (results, ParseReport, whether the result came from the cache)
+    """
+    try:
+        key = cache.key(file_path, options)
+    except OSError:
+        key = None
+    cached = cache.get(key) if key else None
+    if cached is not None:
+        return (tuple(cached["results"]),
+                ParseReport.from_dict(cached["report"]), True)
+
+    results, report = analyze()
+    if key and results is not None and not report.error:
+        cache.put(key, {"results": list(results),
+                        "report": report.to_dict()})
+    return results, report, False
+
+def expand_paths(patterns):
+    """
+    Expand glob patterns, keeping patterns without matches as plain paths.
+    """
+    file_paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        file_paths.extend(matches if matches else [pattern])
+    return file_paths
+
+def format_batch_table(file_paths, rows):
+    """
+    Lay out batch results like A4.2.P1.Results.txt, one column per file.
+    """
+    labels = [os.path.splitext(os.path.basename(path))[0]
+              for path in file_paths]
+    lines = ["\t".join(["TC"] + labels)]
+    lines.append("\t".join(
+        ["COUNT"] + [str(report.values) for _, report, _ in rows]))
+    for label, index in BATCH_ROWS:
+        lines.append("\t".join([label] + [
+            str(results[index]) if results else "#N/A"
+            for results, _, _ in rows]))
+    lines.append("\t".join(
+        ["TIME"] + [f"{elapsed:.6f}" for _, _, elapsed in rows]))
+    return "\n".join(lines)
+
+def run_batch(file_paths, options, workers=None,
+              output_file='BatchStatisticsResults.txt', cache=None):
+    """
+    Compute statistics for many files in a process pool and save one table.
+
+    Files found in ``cache`` are not recomputed.
+    """
+    start_time = time.perf_counter()
+    rows = [None] * len(file_paths)
+    keys = {}
+    if cache is not None:
+        for index, file_path in enumerate(file_paths):
+            lookup_start = time.perf_counter()
+            try:
+                keys[index] = cache.key(file_path, options)
+            except OSError:
+                continue
+            cached = cache.get(keys[index])
+            if cached is not None:
+                rows[index] = (tuple(cached["results"]),
+                               ParseReport.from_dict(cached["report"]),
+                               time.perf_counter() - lookup_start)
+
+    pending = [index for index, row in enumerate(rows) if row is None]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        computed = executor.map(analyze_file_timed,
+                                [file_paths[index] for index in pending],
+                                repeat(options))
+        for index, row in zip(pending, computed):
+            rows[index] = row
+            results, report, _ = row
+            if index in keys and results is not None and not report.error:
+                cache.put(keys[index], {"results": list(results),
+                                        "report": report.to_dict()})
+    elapsed_time = time.perf_counter() - start_time
+    if cache is not None:
+        cache.save()
+
+    for _, report, _ in rows:
+        report.print_summary()
+
+    table = format_batch_table(file_paths, rows)
+    print(table)
+    print(f"Files: {len(file_paths)} ({len(file_paths) - len(pending)} "
+          "from cache)")
+    print(f"Wall-clock Time: {elapsed_time} seconds")
+
+    with open(output_file, 'w', encoding='utf-8') as result_file:
+        result_file.write(table + "\n")
+        result_file.write(f"Files: {len(file_paths)}\n")
+        result_file.write(f"Wall-clock Time: {elapsed_time} seconds\n")
+
 def main():
     """
     Main function to compute descriptive statistics.
     """
-    if len(sys.argv) != 2:
-        print("Usage: python statistics_results.py <file_path>")
-        return
+    parser = argparse.ArgumentParser(
+        description="Compute descriptive statistics for files of numbers.")
+    parser.add_argument("file_paths", nargs="+",
+                        help="files with one number per line; glob patterns "
+                             "are expanded")
+    parser.add_argument("--exact", action="store_true",
+                        help="load every value into memory and compute "
+                             "exact statistics")
+    parser.add_argument("--exact-limit", type=int,
+                        default=DEFAULT_EXACT_LIMIT,
+                        help="values kept for an exact median before the "
+                             "streaming engine switches to a quantile sketch "
+                             "(default: %(default)s)")
+    parser.add_argument("--backend", choices=("python", "numpy"),
+                        default="python",
+                        help="implementation used for the statistics "
+                             "(default: %(default)s)")
+    parser.add_argument("--batch", action="store_true",
+                        help="write the consolidated table even for a "
+                             "single file (implied by several files)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes in batch mode "
+                             "(default: one per CPU)")
+    parser.add_argument("--chunks", type=int, default=1,
+                        help="split a single file into this many byte "
+                             "ranges reduced in parallel (python backend)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep running aggregates in a sidecar state "
+                             "file and read only lines appended since the "
+                             "last run (single file, python backend)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always recompute, bypassing the result cache")
+    parser.add_argument("--cache-file", default=DEFAULT_CACHE_FILE,
+                        help="result cache location (default: %(default)s)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="cached results kept before the least recently "
+                             "used are evicted (default: %(default)s)")
+    parser.add_argument("--output", default='BatchStatisticsResults.txt',
+                        help="results table written in batch mode "
+                             "(default: %(default)s)")
+    args = parser.parse_args()
+    if args.chunks > 1 and (args.exact or args.backend == "numpy"):
+        parser.error("--chunks requires the python backend without --exact")
+    if args.incremental and (args.exact or args.backend == "numpy"
+                             or args.chunks > 1):
+        parser.error("--incremental cannot be combined with --exact, "
+                     "--backend numpy or --chunks")
 
-    file_path = sys.argv[1]
+    backend = args.backend
+    if backend == "numpy" and not numpy_backend.HAVE_NUMPY:
+        print("Warning: NumPy is not installed, using the python backend.")
+        backend = "python"
+    options = {"backend": backend, "exact": args.exact,
+               "exact_limit": args.exact_limit}
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache_file, args.cache_size)
+
+    file_paths = expand_paths(args.file_paths)
+    if args.batch or len(file_paths) > 1:
+        if args.chunks > 1 or args.incremental:
+            parser.error("--chunks and --incremental need a single file "
+                         "without --batch")
+        run_batch(file_paths, options, args.workers, args.output, cache)
+        return
 
     start_time = time.time()
 
-    data = read_file(file_path)
-    if not data:
+    file_path = file_paths[0]
+    if args.incremental:
+        results, report, description = analyze_file_incremental(
+            file_path, args.exact_limit)
+        print(f"Incremental mode: {description}.")
+        report.print_summary()
+        if results is None:
+            return
+        print_and_save_results(results, time.time() - start_time)
+        return
+
+    if args.chunks > 1:
+        options = dict(options, chunks=args.chunks)
+        analyze = partial(analyze_file_chunked, file_path, args.chunks,
+                          args.workers, args.exact_limit)
+    else:
+        analyze = partial(analyze_file, file_path, **options)
+
+    if cache is None:
+        results, report = analyze()
+    else:
+        results, report, from_cache = cached_analysis(
+            cache, file_path, options, analyze)
+        cache.save()
+        if from_cache:
+            print("Using cached statistics.")
+    report.print_summary()
+    if results is None:
         return
 
     elapsed_time = time.time() - start_time
 
-    results = compute_descriptive_statistics(data)
     print_and_save_results(results, elapsed_time)
 
 if __name__ == "__main__":
@@ -7,10 +7,18 @@ Original file is located at
     https://colab.research.google.com/drive/1KcAWf4nTzrAQI9ae6EKf-bZgklH0EoOh
 """
 
+import argparse
 import json
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
 
+from catalogue_index import CatalogueIndex
+from json_stream import iter_records
+from name_cache import DEFAULT_NAME_CACHE_FILE, NameCache
+from sales_aggregates import SalesAggregates
+
 
 def load_json_file(filename):
     """
@@ -34,6 +42,27 @@ def load_json_file(filename):
         return {}
 
 
+def stream_json_records(filename):
+    """
+    Yield the records of a JSON array or JSON Lines file one at a time.
+
+    Records already yielded stay counted if the file turns out to be
+    invalid further on; the error is printed as in ``load_json_file``.
+
+    Args:
+        filename (str): The path to the JSON or JSON Lines file.
+
+    Yields:
+        dict: One sales record.
+    """
+    try:
+        yield from iter_records(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+    except json.JSONDecodeError:
+        print(f"Error: Invalid JSON format in '{filename}'.")
+
+
 def similar(a, b):
     """
     Calculate the similarity ratio between two strings.
@@ -48,30 +77,41 @@ def similar(a, b):
     return SequenceMatcher(None, a, b).ratio()
 
 
-def compute_total_cost(price_catalogue, sales_record):
+def compute_total_cost(price_catalogue, sales_record, index=None,
+                       aggregates=None):
     """
     Compute the total cost of sales based on the price catalogue and
     sales record.
 
+    Each sale is priced with the first catalogue product whose title is
+    at least 0.9 similar to the product name, found through a
+    ``CatalogueIndex``.
+
     Args:
         price_catalogue (list): List of products with prices.
         sales_record (list): List of sales records.
+        index (CatalogueIndex): Index of the catalogue, built if omitted;
+            a ``NameCache`` over the index can be used instead.
+        aggregates (SalesAggregates): Optional grouped totals, updated
+            with every priced sale in the same pass.
 
     Returns:
         float: The total cost of sales.
     """
+    if index is None:
+        index = CatalogueIndex(price_catalogue)
     total_cost = 0
     for sale in sales_record:
         product_name = sale["Product"]
         match_found = False
-        for catalog_product in price_catalogue:
-            similarity = similar(product_name, catalog_product["title"])
-            if similarity >= 0.9:
-                price = catalog_product["price"]
-                quantity = sale["Quantity"]
-                total_cost += price * quantity
-                match_found = True
-                break
+        catalog_product = index.find_similar(product_name)
+        if catalog_product is not None:
+            price = catalog_product["price"]
+            quantity = sale["Quantity"]
+            total_cost += price * quantity
+            match_found = True
+            if aggregates is not None:
+                aggregates.add(sale, catalog_product, price * quantity)
 
         if not match_found:
             if product_name == "Elotes":
@@ -84,13 +124,14 @@ def compute_total_cost(price_catalogue, sales_record):
                 match_found = True
 
             if match_found:
-                for catalog_product in price_catalogue:
-                    if product_name.lower() == \
-                      catalog_product["title"].lower():
-                        price = catalog_product["price"]
-                        quantity = sale["Quantity"]
-                        total_cost += price * quantity
-                        break
+                catalog_product = index.find_exact(product_name)
+                if catalog_product is not None:
+                    price = catalog_product["price"]
+                    quantity = sale["Quantity"]
+                    total_cost += price * quantity
+                    if aggregates is not None:
+                        aggregates.add(sale, catalog_product,
+                                       price * quantity)
             else:
                 print(f"Warning: No match found for product '{product_name}' \
                   in price catalogue.")
@@ -98,37 +139,197 @@ def compute_total_cost(price_catalogue, sales_record):
     return total_cost
 
 
-def main():
+# Catalogue lookups of a pool worker, set up once by init_worker
+WORKER_NAMES = None
+# Partitions per worker; more than one evens out uneven partitions
+PARTITIONS_PER_WORKER = 4
+
+
+def init_worker(index, positions):
     """
-    Main function to compute total sales cost and write results to a file.
+    Pool initializer: keep the prebuilt index and known resolutions.
+
+    Args:
+        index (CatalogueIndex): Index built once by the parent process.
+        positions (dict): Resolutions already known to the parent.
+    """
+    global WORKER_NAMES  # pylint: disable=global-statement
+    WORKER_NAMES = NameCache(index)
+    WORKER_NAMES.positions.update(positions)
+
+
+def total_partition(sales_record):
+    """
+    Total one partition of sales records in a pool worker.
+
+    Returns:
+        tuple: (total cost, SalesAggregates, names resolved, cache hits,
+        cache misses)
+    """
+    names = WORKER_NAMES
+    names.hits = names.misses = 0
+    names.resolved = {}
+    aggregates = SalesAggregates()
+    total_cost = compute_total_cost(names.index.catalogue, sales_record,
+                                    names, aggregates)
+    return total_cost, aggregates, names.resolved, names.hits, names.misses
+
+
+def partition(sales_record, parts):
+    """
+    Split a list of records into at most ``parts`` consecutive slices.
+    """
+    size = max(1, -(-len(sales_record) // parts))
+    return [sales_record[start:start + size]
+            for start in range(0, len(sales_record), size)]
+
+
+def compute_totals_parallel(names, sales_records, workers=None):
+    """
+    Total several lists of sales records in a process pool.
+
+    The records are partitioned, every worker receives the index of
+    ``names`` once through the pool initializer, and the partial totals
+    and grouped totals are added back up per file in partition order.
+    Resolutions and counters of the workers are merged into ``names``.
+
+    Returns:
+        tuple: (list of per-file totals, list of per-file SalesAggregates,
+        {phase: seconds} for the match and reduce phases)
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for file_number, sales_record in enumerate(sales_records):
+        for part in partition(sales_record, workers * PARTITIONS_PER_WORKER):
+            tasks.append((file_number, part))
+
+    timings = {}
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(names.index, names.positions)) \
+            as executor:
+        results = list(executor.map(total_partition,
+                                    [part for _, part in tasks]))
+    timings["match"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    totals = [0] * len(sales_records)
+    file_aggregates = [SalesAggregates() for _ in sales_records]
+    for (file_number, _), (total_cost, aggregates, resolved, hits,
+                           misses) in zip(tasks, results):
+        totals[file_number] += total_cost
+        file_aggregates[file_number].merge(aggregates)
+        names.absorb(resolved, hits, misses)
+    timings["reduce"] = time.perf_counter() - start_time
+    return totals, file_aggregates, timings
+
+
+def main(price_catalogue_file='TC1.ProductList.json',
+         sales_record_files=('TC3.Sales.json',), stream=False, workers=None):
     """
-    # Define the file paths for the price catalogue and sales record
-    price_catalogue_file = 'TC1.ProductList.json'
-    sales_record_file = 'TC3.Sales.json'
+    Main function to compute total sales cost and write results to a file.
 
+    Args:
+        price_catalogue_file (str): The product catalogue.
+        sales_record_files (list): Sales files, totalled one by one and
+            together.
+        stream (bool): Read the sales records one at a time instead of
+            loading the whole file, so memory does not grow with it.
+        workers (int): Total the records in this many processes.
+    """
     start_time = time.time()
+    timings = {}
 
     # Load the price catalogue and sales record from JSON files
+    phase_start = time.perf_counter()
     price_catalogue = load_json_file(price_catalogue_file)
-    sales_record = load_json_file(sales_record_file)
+    if stream:
+        sales_records = [stream_json_records(sales_record_file)
+                         for sales_record_file in sales_record_files]
+    else:
+        sales_records = [load_json_file(sales_record_file)
+                         for sales_record_file in sales_record_files]
+    timings["load"] = time.perf_counter() - phase_start
 
-    # Compute the total cost of sales
-    total_cost = compute_total_cost(price_catalogue, sales_record)
+    phase_start = time.perf_counter()
+    names = NameCache(CatalogueIndex(price_catalogue), DEFAULT_NAME_CACHE_FILE)
+    timings["index build"] = time.perf_counter() - phase_start
+
+    # Compute the total cost of sales, resolving each product name once
+    if workers:
+        totals, file_aggregates, match_timings = compute_totals_parallel(
+            names, sales_records, workers)
+        timings.update(match_timings)
+    else:
+        phase_start = time.perf_counter()
+        file_aggregates = [SalesAggregates() for _ in sales_records]
+        totals = [compute_total_cost(price_catalogue, sales_record, names,
+                                     aggregates)
+                  for sales_record, aggregates in
+                  zip(sales_records, file_aggregates)]
+        timings["match"] = time.perf_counter() - phase_start
+        timings["reduce"] = 0.0
+    phase_start = time.perf_counter()
+    total_cost = sum(totals)
+    combined = SalesAggregates()
+    for aggregates in file_aggregates:
+        combined.merge(aggregates)
+    timings["reduce"] += time.perf_counter() - phase_start
+    names.save()
+    if stream:
+        # Streamed records are parsed as they are matched, so the load
+        # phase only covers the catalogue
+        labels = {"load": "load catalogue", "match": "load sales + match"}
+        timings = {labels.get(phase, phase): seconds
+                   for phase, seconds in timings.items()}
 
     end_time = time.time()
     elapsed_time = end_time - start_time
 
-    # Print the total cost of sales and elapsed time
-    print(f"Total cost of sales: ${total_cost:.2f}")
-    print(f"Time elapsed: {elapsed_time:.2f} seconds")
+    lines = []
+    if len(sales_record_files) > 1:
+        lines.extend(f"{sales_record_file}: ${file_total:.2f}"
+                     for sales_record_file, file_total in
+                     zip(sales_record_files, totals))
+    lines.append(f"Total cost of sales: ${total_cost:.2f}")
+    lines.append(f"Time elapsed: {elapsed_time:.2f} seconds")
+    lines.append("Phase times: " + ", ".join(
+        f"{phase} {seconds:.4f} s" for phase, seconds in timings.items()))
+    lines.append(names.summary())
 
-    # Write the results to a file
+    # Print the results and write them to a file
+    print("\n".join(lines))
     with open("SalesResults.txt", "w", encoding='utf-8') as results_file:
-        results_file.write(f"Total cost of sales: ${total_cost:.2f}\n")
-        results_file.write(f"Time elapsed: {elapsed_time:.2f} seconds")
+        results_file.write("\n".join(lines))
+
+    # Grouped totals go to a tabular report next to SalesResults.txt
+    with open("SalesReport.txt", "w", encoding='utf-8') as report_file:
+        combined.write_report(
+            report_file, list(zip(sales_record_files, file_aggregates))
+            if len(sales_record_files) > 1 else None)
+
+
+def cli():
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compute the total cost of sales files.")
+    parser.add_argument("catalogue", nargs="?", default="TC1.ProductList.json",
+                        help="product catalogue (default: %(default)s)")
+    parser.add_argument("sales_files", nargs="*", default=["TC3.Sales.json"],
+                        help="sales files (default: TC3.Sales.json)")
+    parser.add_argument("--stream", action="store_true",
+                        help="read the sales records one at a time")
+    parser.add_argument("--workers", type=int,
+                        help="total the records in this many processes")
+    args = parser.parse_args()
+    if args.stream and args.workers:
+        parser.error("--stream cannot be combined with --workers")
+    main(args.catalogue, args.sales_files, args.stream, args.workers)
 
 
 # Run the main function
 if __name__ == "__main__":
-    main()
+    cli()
 # pylint: disable=missing-final-newline
\ No newline at end of file
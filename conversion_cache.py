@@ -0,0 +1,111 @@
+"""
+Memoized binary and hexadecimal conversion for repetitive inputs.
+
+Every distinct integer is converted once.  While the values span a small
+range the results come from a precomputed table indexed by value; wider
+ranges go through a bounded LRU cache.  Hits and misses are counted per
+value served, a miss being a value that had to be converted.
+"""
+from collections import OrderedDict
+
+from cache_utils import hit_rate_summary
+
+# Widest value range served from a precomputed table
+TABLE_RANGE_LIMIT = 1 << 16
+DEFAULT_LRU_SIZE = 1 << 16
+
+
+class ConversionCache:
+    """
+    Convert batches of numbers, reusing earlier conversions.
+    """
+
+    def __init__(self, lru_size=DEFAULT_LRU_SIZE):
+        self.lru_size = lru_size
+        self.lru = OrderedDict()
+        self.table_start = None
+        self.binary_table = []
+        self.hex_table = []
+        self.hits = 0
+        self.misses = 0
+
+    def convert(self, values):
+        """
+        Convert a batch like ``convert_numbers.convert_batch``.
+
+        Returns:
+            tuple: (binary text, hexadecimal text), one line per value.
+        """
+        integers = list(map(int, values))
+        if not integers:
+            return "", ""
+        lowest, highest = min(integers), max(integers)
+        if self._table_covers(lowest, highest, len(integers)):
+            start = self.table_start
+            offsets = [value - start for value in integers]
+            binary = map(self.binary_table.__getitem__, offsets)
+            hexadecimal = map(self.hex_table.__getitem__, offsets)
+        else:
+            results = self._lookup_distinct(integers)
+            binary = (results[value][0] for value in integers)
+            hexadecimal = (results[value][1] for value in integers)
+        return "\n".join(binary) + "\n", "\n".join(hexadecimal) + "\n"
+
+    def _table_covers(self, lowest, highest, count):
+        """
+        Make sure the table spans [lowest, highest] if that is worthwhile.
+
+        A table is only built or grown while its span stays within
+        ``TABLE_RANGE_LIMIT`` and is no larger than the batch it serves.
+        """
+        if self.table_start is None:
+            start, stop = lowest, highest + 1
+        else:
+            start = min(lowest, self.table_start)
+            stop = max(highest + 1, self.table_start + len(self.binary_table))
+        new_entries = (stop - start) - len(self.binary_table)
+        if stop - start > TABLE_RANGE_LIMIT or new_entries > count:
+            return False
+
+        if new_entries:
+            if self.table_start is None:
+                before, after = range(start, stop), range(0)
+            else:
+                before = range(start, self.table_start)
+                after = range(self.table_start + len(self.binary_table), stop)
+            self.binary_table = ([bin(v) for v in before] + self.binary_table
+                                 + [bin(v) for v in after])
+            self.hex_table = ([hex(v) for v in before] + self.hex_table
+                              + [hex(v) for v in after])
+            self.table_start = start
+        self.misses += new_entries
+        self.hits += count - new_entries
+        return True
+
+    def _lookup_distinct(self, integers):
+        """
+        Return {value: (binary, hexadecimal)} for the distinct integers,
+        converting only those missing from the LRU cache.
+        """
+        results = dict.fromkeys(integers)
+        misses = 0
+        for value in results:
+            entry = self.lru.get(value)
+            if entry is None:
+                misses += 1
+                entry = (bin(value), hex(value))
+                self.lru[value] = entry
+                if len(self.lru) > self.lru_size:
+                    self.lru.popitem(last=False)
+            else:
+                self.lru.move_to_end(value)
+            results[value] = entry
+        self.misses += misses
+        self.hits += len(integers) - misses
+        return results
+
+    def summary(self):
+        """
+        Return a one-line description of the hit and miss counters.
+        """
+        return hit_rate_summary("Cache", self.hits, self.misses)
@@ -2,38 +2,30 @@
 Converts from hexadecimal to binary
 and binary to hexadecimal
 """
+import argparse
+import shutil
 import sys
+import tempfile
 import time
 
-# Set working directory
-DIR = r"C:\Users\Sebastian\Downloads\P2_1\P2\TC1.txt"
-sys.argv = ['convertNumbers.py', DIR]
+from conversion_cache import DEFAULT_LRU_SIZE, ConversionCache
+from fixed_width import WIDTHS, convert_fixed_width, split_accepted
+from integer_parser import BASES, iter_integer_blocks
+from numeric_parser import ParseReport, iter_blocks, parse_numeric_file
+from output_sinks import SINKS, open_sink
+
+# Values converted per batch in streaming mode
+BATCH_SIZE = 65536
+# Buffer size of the streaming writers
+WRITE_BUFFER = 1 << 20
+RESULTS_FILE = 'ConversionResults.txt'
 
 def read_file(file_path):
     """
-    Read the file and return a list of numbers.
-    """
-    data = []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            # pylint: disable=W1514
-            for line_num, line in enumerate(file, start=1):
-                try:
-                    number = float(line.strip())
-                    data.append(number)
-                except ValueError:
-                    print(f"Warning: Invalid data at line {line_num}: '{line}'")
-
-    except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.")
-        return []
-    except PermissionError:
-        print(f"Error: Permission denied for file '{file_path}'.")
-        return []
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return []
-
+    Read the file and return an array of numbers.
+    """
+    data, report = parse_numeric_file(file_path)
+    report.print_summary()
     return data
 
 def convert_numbers(data):
@@ -44,7 +36,8 @@ def convert_numbers(data):
     hexadecimal_results = [hex(int(num)) for num in data]
     return binary_results, hexadecimal_results
 
-def print_and_save_results(binary_results, hexadecimal_results, elapsed_time):
+def print_and_save_results(binary_results, hexadecimal_results, elapsed_time,
+                           output_file=RESULTS_FILE):
     """
     Print and save the conversion results along with the elapsed time.
     """
@@ -57,7 +50,7 @@ def print_and_save_results(binary_results, hexadecimal_results, elapsed_time):
         print(result)
 
     # Save results to file
-    with open('ConversionResults.txt', 'w',  encoding='utf-8') as result_file:
+    with open(output_file, 'w',  encoding='utf-8') as result_file:
         # pylint: disable=W1514
         result_file.write("Conversion Results:\n")
         result_file.write("Binary:\n")
@@ -66,26 +59,250 @@ def print_and_save_results(binary_results, hexadecimal_results, elapsed_time):
         result_file.write("\n".join(hexadecimal_results) + "\n\n")
         result_file.write(f"Time Elapsed: {elapsed_time} seconds\n")
 
-def main():
+def convert_batch(values, width=None, cache=None):
     """
-    Main function to convert numbers to binary and hexadecimal.
+    Convert a batch of numbers to binary and hexadecimal text blocks.
+
+    Without ``width`` this matches ``convert_numbers``; with it, values are
+    written in ``width``-bit two's complement and non-integers or values
+    out of range are rejected.  A ``ConversionCache`` converts each
+    distinct value only once.
+
+    Returns:
+        tuple: (binary text, hexadecimal text, rejected (index, value)
+        pairs)
+    """
+    if width:
+        return convert_fixed_width(values, width)
+    if cache is not None:
+        return cache.convert(values) + ([],)
+    integers = list(map(int, values))
+    return ("".join(f"{b}\n" for b in map(bin, integers)),
+            "".join(f"{h}\n" for h in map(hex, integers)),
+            [])
+
+def print_rejected(rejected, width, limit=10):
     """
-    if len(sys.argv) != 2:
-        print("Usage: python convertNumbers.py <file_path>")
+    Print the values that could not be converted at a fixed width.
+    """
+    if not rejected:
         return
+    print(f"Warning: {len(rejected)} value(s) skipped because they are not "
+          f"integers that fit in {width} bits:")
+    for index, value in rejected[:limit]:
+        print(f"  value #{index + 1}: {value}")
+    if len(rejected) > limit:
+        print(f"  ... and {len(rejected) - limit} more")
+
+def save_text_results(binary_text, hexadecimal_text, elapsed_time,
+                      extra_lines=(), output_file=RESULTS_FILE):
+    """
+    Print and save converted text blocks in the layout of
+    ``print_and_save_results``, followed by any ``extra_lines``.
+    """
+    print("Conversion Results:")
+    print("Binary:")
+    sys.stdout.write(binary_text)
+    print("\nHexadecimal:")
+    sys.stdout.write(hexadecimal_text)
+
+    with open(output_file, 'w', encoding='utf-8') as result_file:
+        result_file.write("Conversion Results:\n")
+        result_file.write("Binary:\n")
+        result_file.write(binary_text + "\n")
+        result_file.write("Hexadecimal:\n")
+        result_file.write(hexadecimal_text + "\n")
+        result_file.write(f"Time Elapsed: {elapsed_time} seconds\n")
+        for line in extra_lines:
+            result_file.write(line + "\n")
+
+def convert_file_streaming(file_path, output_file=RESULTS_FILE,
+                           echo=False, batch_size=BATCH_SIZE, width=None,
+                           cache=None):
+    """
+    Convert a file in batches and stream the results to ``output_file``.
 
-    file_path = sys.argv[1]
+    Memory stays bounded by the batch size: binary lines go straight to
+    the output file, hexadecimal lines to a temporary spool file that is
+    copied after them.  The layout matches ``print_and_save_results``.
 
+    Returns:
+        tuple: (number of values converted, ParseReport, rejected
+        (index, value) pairs)
+    """
     start_time = time.time()
+    report = ParseReport(file_path)
+    count = 0
+    rejected = []
+    with open(output_file, 'w', encoding='utf-8',
+              buffering=WRITE_BUFFER) as result_file, \
+            tempfile.TemporaryFile('w+', encoding='utf-8',
+                                   buffering=WRITE_BUFFER) as hex_spool:
+        result_file.write("Conversion Results:\n")
+        result_file.write("Binary:\n")
+        for block in iter_blocks(file_path, report):
+            for start in range(0, len(block), batch_size):
+                batch = block[start:start + batch_size]
+                binary_text, hexadecimal_text, batch_rejected = \
+                    convert_batch(batch, width, cache)
+                result_file.write(binary_text)
+                hex_spool.write(hexadecimal_text)
+                if echo:
+                    sys.stdout.write("".join(
+                        f"{b} {h}\n" for b, h in zip(
+                            binary_text.splitlines(),
+                            hexadecimal_text.splitlines())))
+                rejected.extend((count + index, value)
+                                for index, value in batch_rejected)
+                count += len(batch)
+        result_file.write("\nHexadecimal:\n")
+        hex_spool.seek(0)
+        shutil.copyfileobj(hex_spool, result_file, WRITE_BUFFER)
+        result_file.write("\n")
+        result_file.write(
+            f"Time Elapsed: {time.time() - start_time} seconds\n")
+        if cache is not None:
+            result_file.write(cache.summary() + "\n")
+    return count - len(rejected), report, rejected
+
+def convert_file_to_sink(file_path, sink, input_base=None):
+    """
+    Convert a file block by block into an output sink.
+
+    The file holds decimal numbers, or binary/hexadecimal tokens if
+    ``input_base`` is set (0 for prefixed tokens of either base).  Values
+    that do not fit the sink's width, if it has one, are rejected.
+
+    Returns:
+        tuple: (number of values converted, ParseReport, rejected
+        (index, value) pairs)
+    """
+    report = ParseReport(file_path)
+    count = 0
+    rejected = []
+    if input_base is None:
+        blocks = iter_blocks(file_path, report)
+    else:
+        blocks = iter_integer_blocks(file_path, report, input_base)
+    for block in blocks:
+        if sink.width:
+            integers, block_rejected = split_accepted(block, sink.width)
+            rejected.extend((count + index, value)
+                            for index, value in block_rejected)
+        else:
+            integers = list(map(int, block))
+        sink.write_rows(integers)
+        count += len(block)
+    return sink.rows, report, rejected
+
+def main():
+    """
+    Main function to convert numbers to binary and hexadecimal.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert numbers to binary and hexadecimal.")
+    parser.add_argument("file_path", help="file with one number per line")
+    parser.add_argument("--stream", action="store_true",
+                        help="convert in batches and write the results "
+                             "in bounded memory")
+    parser.add_argument("--echo", action="store_true",
+                        help="also print every result in streaming mode")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="values converted per batch in streaming mode "
+                             "(default: %(default)s)")
+    parser.add_argument("--width", type=int, choices=WIDTHS,
+                        help="write fixed-width two's-complement results "
+                             "with this many bits")
+    parser.add_argument("--memo", action="store_true",
+                        help="convert each distinct value only once and "
+                             "report cache hits and misses")
+    parser.add_argument("--lru-size", type=int, default=DEFAULT_LRU_SIZE,
+                        help="conversions kept when values span too wide a "
+                             "range for a lookup table (default: %(default)s)")
+    parser.add_argument("--format", choices=sorted(SINKS),
+                        help="write one decimal/binary/hex row per number in "
+                             "this format instead of the default report")
+    parser.add_argument("--reverse", action="store_true",
+                        help="read binary/hexadecimal tokens instead of "
+                             "decimal numbers (implies --format text)")
+    parser.add_argument("--input-base", type=int, choices=BASES,
+                        help="base of the tokens in --reverse mode; without "
+                             "it every token needs a 0b or 0x prefix")
+    parser.add_argument("--output",
+                        help="results file (default: ConversionResults with "
+                             "the format's extension)")
+    args = parser.parse_args()
+    if args.memo and args.width:
+        parser.error("--memo cannot be combined with --width")
+    if args.input_base and not args.reverse:
+        parser.error("--input-base requires --reverse")
+    if args.reverse:
+        if args.stream or args.memo:
+            parser.error("--reverse cannot be combined with --stream "
+                         "or --memo")
+        args.format = args.format or "text"
+    if args.memo and args.format:
+        parser.error("--memo cannot be combined with --format")
+    output_file = args.output or RESULTS_FILE
+    cache = ConversionCache(args.lru_size) if args.memo else None
+    file_path = args.file_path
+
+    start_time = time.time()
+
+    if args.format:
+        try:
+            sink = open_sink(args.format, args.output, args.width)
+        except OSError as e:
+            print(f"Error: Could not write results: {e}")
+            return
+        input_base = (args.input_base or 0) if args.reverse else None
+        with sink:
+            count, report, rejected = convert_file_to_sink(
+                file_path, sink, input_base)
+        report.print_summary()
+        print_rejected(rejected, sink.width)
+        print(f"Converted {count} numbers to {sink.file_path} in "
+              f"{time.time() - start_time} seconds.")
+        return
+
+    if args.stream:
+        count, report, rejected = convert_file_streaming(
+            file_path, output_file, echo=args.echo, batch_size=args.batch_size,
+            width=args.width, cache=cache)
+        report.print_summary()
+        print_rejected(rejected, args.width)
+        print(f"Converted {count} numbers in "
+              f"{time.time() - start_time} seconds.")
+        if cache is not None:
+            print(cache.summary())
+        return
 
     data = read_file(file_path)
     if not data:
         return
 
+    if cache is not None:
+        binary_text, hexadecimal_text = cache.convert(data)
+        elapsed_time = time.time() - start_time
+        save_text_results(binary_text, hexadecimal_text, elapsed_time,
+                          [cache.summary()], output_file)
+        print(f"Time Elapsed: {elapsed_time} seconds")
+        print(cache.summary())
+        return
+
     elapsed_time = time.time() - start_time
 
+    if args.width:
+        binary_text, hexadecimal_text, rejected = convert_fixed_width(
+            data, args.width)
+        print_rejected(rejected, args.width)
+        save_text_results(binary_text, hexadecimal_text, elapsed_time,
+                          output_file=output_file)
+        return
+
     binary_results, hexadecimal_results = convert_numbers(data)
-    print_and_save_results(binary_results, hexadecimal_results, elapsed_time)
+    print_and_save_results(binary_results, hexadecimal_results, elapsed_time,
+                           output_file)
 
 if __name__ == "__main__":
     main()
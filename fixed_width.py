@@ -0,0 +1,126 @@
+"""
+Fixed-width two's-complement conversion to binary and hexadecimal.
+
+Whole arrays are converted at once: NumPy reinterprets the integers as
+unsigned bytes and looks every byte up in a 256-entry table of ASCII
+digits, producing the finished text block without a per-value ``bin`` or
+``hex`` call.  Without NumPy an equivalent pure Python path is used.
+"""
+from numpy_backend import HAVE_NUMPY, np
+
+WIDTHS = (8, 16, 32, 64)
+
+if HAVE_NUMPY:
+    # The ASCII digits of every byte value packed into one table element,
+    # so a lookup copies a whole byte's worth of digits at once
+    BINARY_DIGITS = np.frombuffer(
+        "".join(format(i, '08b') for i in range(256)).encode(), np.uint64)
+    HEX_DIGITS = np.frombuffer(
+        "".join(format(i, '02x') for i in range(256)).encode(), np.uint16)
+else:  # pragma: no cover - depends on the environment
+    BINARY_DIGITS = HEX_DIGITS = None
+
+
+def accepted_range(width):
+    """
+    Return the (lowest, highest) integer that fits in ``width`` bits.
+
+    Negative numbers down to -2**(width-1) are stored in two's complement;
+    positive numbers up to 2**width - 1 are stored as unsigned.
+    """
+    return -(1 << (width - 1)), (1 << width) - 1
+
+
+def convert_fixed_width(values, width):
+    """
+    Convert numbers to fixed-width binary and hexadecimal text.
+
+    Values that are not integers, or that do not fit in ``width`` bits,
+    are rejected instead of being truncated.
+
+    Returns:
+        tuple: (binary text, hexadecimal text, rejected (index, value)
+        pairs); each text has one ``0b``/``0x`` line per accepted value.
+    """
+    if width not in WIDTHS:
+        raise ValueError(f"width must be one of {WIDTHS}, not {width}")
+    if HAVE_NUMPY:
+        return _convert_numpy(np.asarray(values, dtype=np.float64), width)
+    return _convert_python(values, width)
+
+
+def split_accepted(values, width):
+    """
+    Separate the values that fit in ``width`` bits from the rest.
+
+    ``values`` may hold floats or ints.
+
+    Returns:
+        tuple: (accepted values as ints, rejected (index, value) pairs)
+    """
+    lowest, highest = accepted_range(width)
+    accepted = []
+    rejected = []
+    for index, value in enumerate(values):
+        # The range check comes first: it also rejects NaN and infinity
+        if not (lowest <= value <= highest and float(value).is_integer()):
+            rejected.append((index, value))
+            continue
+        accepted.append(int(value))
+    return accepted, rejected
+
+
+def _convert_python(values, width):
+    """
+    Pure Python fallback of ``convert_fixed_width``.
+    """
+    mask = (1 << width) - 1
+    binary_format = f"0b{{:0{width}b}}\n"
+    hex_format = f"0x{{:0{width // 4}x}}\n"
+    accepted, rejected = split_accepted(values, width)
+    unsigned = [value & mask for value in accepted]
+    return ("".join(map(binary_format.format, unsigned)),
+            "".join(map(hex_format.format, unsigned)),
+            rejected)
+
+
+def _convert_numpy(values, width):
+    """
+    NumPy implementation of ``convert_fixed_width``.
+    """
+    valid = np.isfinite(values)
+    valid[valid] = np.floor(values[valid]) == values[valid]
+    valid &= (values >= -2.0 ** (width - 1)) & (values < 2.0 ** width)
+    rejected_index = np.flatnonzero(~valid)
+    rejected = list(zip(rejected_index.tolist(),
+                        values[rejected_index].tolist()))
+    accepted = values[valid]
+    if not accepted.size:
+        return "", "", rejected
+
+    # Two's complement: negatives go through int64, the rest through uint64
+    unsigned = np.empty(accepted.size, np.uint64)
+    negative = accepted < 0
+    unsigned[negative] = accepted[negative].astype(np.int64).view(np.uint64)
+    unsigned[~negative] = accepted[~negative].astype(np.uint64)
+
+    n_bytes = width // 8
+    as_bytes = unsigned.astype('>u8').view(np.uint8).reshape(-1, 8)
+    as_bytes = as_bytes[:, 8 - n_bytes:]
+    return (_render(BINARY_DIGITS[as_bytes], b'0b'),
+            _render(HEX_DIGITS[as_bytes], b'0x'),
+            rejected)
+
+
+def _render(digits, prefix):
+    """
+    Lay out a (rows, bytes) array of packed digits as prefixed text lines.
+    """
+    rows = digits.shape[0]
+    digits = digits.view(np.uint8).reshape(rows, -1)
+    lines = np.empty((rows, digits.shape[1] + 3), np.uint8)
+    lines[:, 0] = prefix[0]
+    lines[:, 1] = prefix[1]
+    lines[:, 2:-1] = digits
+    lines[:, -1] = ord('\n')
+    return lines.tobytes().decode('ascii')
@@ -0,0 +1,102 @@
+"""
+Frequency table used to find the mode(s) of a list of numbers in linear time.
+"""
+import heapq
+from collections import Counter
+from itertools import groupby
+
+
+class FrequencyTable:
+    """
+    Count how often each value occurs.
+
+    Values keep the order in which they were first counted, so ties for
+    the mode are broken in favour of the value that appeared first.
+    """
+
+    def __init__(self, counts=None):
+        self.counts = Counter(counts) if counts else Counter()
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Build a table from any iterable of values.
+        """
+        table = cls()
+        table.counts.update(values)
+        return table
+
+    @classmethod
+    def from_sorted(cls, sorted_values):
+        """
+        Build a table from already sorted values with a run-length pass.
+
+        Ties are then broken in favour of the smallest value.
+        """
+        table = cls()
+        table.counts.update(
+            {value: sum(1 for _ in run) for value, run in groupby(sorted_values)})
+        return table
+
+    def update(self, values):
+        """
+        Count every value of an iterable.
+        """
+        self.counts.update(values)
+
+    def add(self, value, count=1):
+        """
+        Count one value ``count`` times.
+        """
+        self.counts[value] += count
+
+    def merge(self, other):
+        """
+        Add the counts of another table to this one.
+        """
+        self.counts.update(other.counts)
+
+    def to_list(self):
+        """
+        Return the counts as [value, count] pairs in first-seen order.
+        """
+        return [[value, count] for value, count in self.counts.items()]
+
+    @classmethod
+    def from_list(cls, pairs):
+        """
+        Rebuild a table saved with ``to_list``.
+        """
+        table = cls()
+        for value, count in pairs:
+            table.counts[value] = count
+        return table
+
+    def max_count(self):
+        """
+        Return the highest count, or 0 for an empty table.
+        """
+        return max(self.counts.values(), default=0)
+
+    def modes(self):
+        """
+        Return every value sharing the highest count.
+        """
+        max_count = self.max_count()
+        return [k for k, v in self.counts.items() if v == max_count]
+
+    def mode(self):
+        """
+        Return the first value with the highest count, or None if empty.
+        """
+        max_count = self.max_count()
+        return next(
+            (k for k, v in self.counts.items() if v == max_count), None)
+
+    def top(self, k):
+        """
+        Return the ``k`` most frequent (value, count) pairs.
+
+        Ties keep first-seen order, like ``Counter.most_common``.
+        """
+        return heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
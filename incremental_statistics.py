@@ -0,0 +1,154 @@
+"""
+Incremental statistics for numeric files that only grow by appending.
+
+The aggregates and the byte offset reached so far are saved in a sidecar
+state file next to the input.  The next run reads only the bytes appended
+since then.  If the file was truncated or rewritten, it is processed from
+the start again.  A rewrite is detected with a SHA-256 of the whole
+processed prefix; hashing runs at disk speed, well ahead of parsing.
+"""
+import hashlib
+import json
+import os
+
+from cache_utils import write_json_atomic
+from numeric_parser import ParseReport, iter_blocks
+from streaming_statistics import StatisticsAccumulator
+
+STATE_SUFFIX = '.stats-state.json'
+STATE_VERSION = 2
+SCAN_BLOCK = 1 << 16
+HASH_BLOCK = 1 << 20
+
+
+def state_path(file_path):
+    """
+    Return the sidecar state file used for ``file_path``.
+    """
+    return file_path + STATE_SUFFIX
+
+
+def hash_range(digest, file, start, end):
+    """
+    Feed ``file[start:end]`` to ``digest`` and return it.
+    """
+    file.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        block = file.read(min(HASH_BLOCK, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest
+
+
+def last_line_end(file, start, size):
+    """
+    Return the offset just after the last newline in ``file[start:size]``,
+    or ``start`` if that range holds no newline.
+    """
+    end = size
+    while end > start:
+        block_start = max(start, end - SCAN_BLOCK)
+        file.seek(block_start)
+        cut = file.read(end - block_start).rfind(b'\n')
+        if cut >= 0:
+            return block_start + cut + 1
+        end = block_start
+    return start
+
+
+def load_state(file_path):
+    """
+    Return the saved state of ``file_path``, or None if there is none.
+    """
+    try:
+        with open(state_path(file_path), 'r', encoding='utf-8') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def save_state(file_path, state):
+    """
+    Write the sidecar state file atomically.
+    """
+    write_json_atomic(state_path(file_path), state)
+
+
+def analyze_file_incremental(file_path, exact_limit):
+    """
+    Update the saved aggregates of ``file_path`` with its new lines.
+
+    Only complete lines are saved in the state; a final line without a
+    newline counts in this run's results and is read again next time.
+
+    Returns:
+        tuple: (results, ParseReport for the lines read in this run,
+        description of what was read)
+    """
+    report = ParseReport(file_path)
+    try:
+        size = os.path.getsize(file_path)
+        file = open(file_path, 'rb')
+    except FileNotFoundError:
+        report.error = f"File '{file_path}' not found."
+        return None, report, "nothing"
+    except OSError as e:
+        report.error = f"Could not read '{file_path}': {e}"
+        return None, report, "nothing"
+
+    with file:
+        state = load_state(file_path)
+        reason = None
+        if state is None:
+            reason = "no saved state"
+        elif state["exact_limit"] != exact_limit:
+            reason = "different --exact-limit"
+        elif state["offset"] > size:
+            reason = "file was truncated"
+        else:
+            digest = hash_range(hashlib.sha256(), file, 0, state["offset"])
+            if digest.hexdigest() != state["fingerprint"]:
+                reason = "file was rewritten"
+
+        if reason is None:
+            accumulator = StatisticsAccumulator.from_dict(state["aggregates"])
+            start, lines_before = state["offset"], state["lines"]
+            description = f"incremental from byte {start}"
+        else:
+            accumulator = StatisticsAccumulator(exact_limit)
+            start, lines_before = 0, 0
+            description = f"full recompute ({reason})"
+            digest = hashlib.sha256()
+
+        # The hash of the checked prefix continues over the new lines
+        end = last_line_end(file, start, size)
+        fingerprint = hash_range(digest, file, start, end).hexdigest()
+
+    new_report = ParseReport(file_path)
+    for block in iter_blocks(file_path, new_report, start=start, end=end):
+        accumulator.update_many(block)
+    if new_report.error:
+        report.error = new_report.error
+        return None, report, description
+
+    save_state(file_path, {
+        "version": STATE_VERSION,
+        "exact_limit": exact_limit,
+        "offset": end,
+        "lines": lines_before + new_report.lines,
+        "fingerprint": fingerprint,
+        "aggregates": accumulator.to_dict(),
+    })
+
+    report.merge(new_report, line_offset=lines_before)
+    partial_report = ParseReport(file_path)
+    for block in iter_blocks(file_path, partial_report, start=end):
+        accumulator.update_many(block)
+    report.merge(partial_report, line_offset=lines_before + report.lines)
+
+    results = accumulator.results() if accumulator.stats.count else None
+    return results, report, description
@@ -0,0 +1,75 @@
+"""
+Bulk reader for files of binary or hexadecimal integer tokens.
+
+Tokens are ``0b``/``0x`` prefixed numbers, or raw digits when the base is
+given, one per line with an optional sign.  Lines go through the chunked
+reader of ``numeric_parser`` and every slice is parsed with one
+``map(int, lines, repeat(base))`` call; only a slice that holds a bad
+token is retried line by line, and bad tokens are collected in a
+``ParseReport``.
+"""
+import re
+from functools import partial
+from itertools import repeat
+
+from numeric_parser import CHUNK_SIZE, SLICE_LINES, iter_blocks
+
+BASES = (2, 16)
+# Start of a line holding a 0b or 0x token
+PREFIXED = re.compile(rb'^[ \t]*[+-]?0[bBxX]', re.MULTILINE)
+
+
+def is_valid_token(token, base):
+    """
+    Return True if a stripped token is acceptable in ``base``.
+
+    ``int`` also accepts underscores and, with base 0, decimal and octal
+    numbers; those are not tokens of this format.
+    """
+    if b'_' in token:
+        return False
+    if base == 0:
+        return PREFIXED.match(token) is not None
+    return True
+
+
+def convert_tokens(lines, first_line, report, base=0):
+    """
+    Convert a list of byte lines to a list of ints.
+
+    With ``base`` 0 every token needs a ``0b`` or ``0x`` prefix; with 2 or
+    16 the matching prefix is optional.
+    """
+    report.lines += len(lines)
+    values = []
+    for start in range(0, len(lines), SLICE_LINES):
+        piece = lines[start:start + SLICE_LINES]
+        joined = b'\n'.join(piece)
+        if b'_' not in joined and (
+                base or len(PREFIXED.findall(joined)) == len(piece)):
+            try:
+                # Converted into a list first, so a bad token leaves no
+                # partial slice behind for the per-line retry to repeat
+                values.extend(list(map(int, piece, repeat(base))))
+                continue
+            except ValueError:
+                pass
+        for line_num, line in enumerate(piece, start=first_line + start):
+            token = line.strip()
+            try:
+                if not is_valid_token(token, base):
+                    raise ValueError(token)
+                values.append(int(token, base))
+            except ValueError:
+                report.add_invalid(line_num, line.rstrip(b'\r'))
+    report.values += len(values)
+    return values
+
+
+def iter_integer_blocks(file_path, report, base=0, chunk_size=CHUNK_SIZE):
+    """
+    Yield the integers of a token file as a sequence of lists.
+    """
+    return iter_blocks(file_path, report, chunk_size,
+                       convert=partial(convert_tokens, base=base))
+
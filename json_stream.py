@@ -0,0 +1,140 @@
+"""
+Incremental readers for large JSON record files.
+
+``iter_json_array`` yields the elements of a top-level JSON array one at a
+time: the file is read in chunks and every element is parsed with
+``JSONDecoder.raw_decode`` as soon as it is complete, so memory holds one
+chunk and one record instead of the whole list.  ``iter_json_lines``
+reads the JSON Lines variant, one record per line.
+"""
+import json
+
+CHUNK_SIZE = 1 << 20
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+WHITESPACE = ' \t\n\r'
+# Characters that could continue a number cut at the end of the buffer
+NUMBER_CHARS = '0123456789+-.eE'
+
+
+class JsonArrayReader:
+    """
+    Chunked text buffer with the parsing steps of a top-level array.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Append the next chunk, dropping the consumed part of the buffer.
+
+        Returns:
+            bool: False once the file is exhausted.
+        """
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def next_char(self):
+        """
+        Skip whitespace and return the next character, or '' at the end.
+        """
+        while True:
+            while self.position < len(self.buffer) \
+                    and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ''
+
+    def expect(self, allowed):
+        """
+        Consume the next character, which must be one of ``allowed``.
+
+        Raises:
+            json.JSONDecodeError: on any other character.
+        """
+        char = self.next_char()
+        if not char or char not in allowed:
+            raise json.JSONDecodeError(
+                f"Expected one of {allowed!r}", self.buffer, self.position)
+        self.position += 1
+        return char
+
+    def decode_value(self):
+        """
+        Decode the value at the current position, reading more as needed.
+
+        A value that reaches the end of the buffer may be cut short (a
+        number, for instance), so it is only accepted once a character
+        that cannot continue it follows, or the file has ended.
+        """
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer,
+                                                     self.position)
+            except json.JSONDecodeError:
+                if self.eof or not self.fill():
+                    raise
+                continue
+            if self.eof or (end < len(self.buffer)
+                            and self.buffer[end] not in NUMBER_CHARS):
+                self.position = end
+                return value
+            self.fill()
+
+
+def iter_json_array(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of the top-level JSON array in a file.
+
+    Raises:
+        OSError: if the file cannot be read.
+        json.JSONDecodeError: if the content is not a JSON array.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        reader = JsonArrayReader(file, chunk_size)
+        reader.expect('[')
+        if reader.next_char() == ']':
+            reader.position += 1
+        else:
+            while True:
+                reader.next_char()
+                yield reader.decode_value()
+                if reader.expect(',]') == ']':
+                    break
+        if reader.next_char():
+            raise json.JSONDecodeError("Extra data", reader.buffer,
+                                       reader.position)
+
+
+def iter_json_lines(file_path):
+    """
+    Yield the record on each non-blank line of a JSON Lines file.
+
+    Raises:
+        OSError: if the file cannot be read.
+        json.JSONDecodeError: on a line that is not valid JSON.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_records(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Yield the records of a JSON array file, or of a JSON Lines file when
+    the name ends in .jsonl or .ndjson.
+    """
+    if file_path.lower().endswith(JSON_LINES_EXTENSIONS):
+        return iter_json_lines(file_path)
+    return iter_json_array(file_path, chunk_size)
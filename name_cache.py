@@ -0,0 +1,106 @@
+"""
+Cache of product-name resolutions for the sales calculator.
+
+Sales files repeat the same product names many times.  ``NameCache``
+remembers which catalogue position each name resolved to, or that it
+matched nothing, and can persist that to a JSON file.  The file is keyed
+by a fingerprint of the catalogue and the similarity threshold, so any
+change to the catalogue discards the saved resolutions.
+"""
+import hashlib
+import json
+
+from cache_utils import hit_rate_summary, write_json_atomic
+
+DEFAULT_NAME_CACHE_FILE = '.sales_name_cache.json'
+
+
+def catalogue_fingerprint(catalogue, threshold):
+    """
+    Return a SHA-256 of the catalogue content and the match threshold.
+    """
+    text = json.dumps([catalogue, threshold], sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class NameCache:
+    """
+    Memoizing wrapper with the lookup methods of ``CatalogueIndex``.
+    """
+
+    def __init__(self, index, cache_file=None):
+        self.index = index
+        self.cache_file = cache_file
+        self.fingerprint = catalogue_fingerprint(index.catalogue,
+                                                 index.threshold)
+        # Product name -> catalogue position, or None for no match
+        self.positions = {}
+        # Names resolved by this process, for pool workers to send back
+        self.resolved = {}
+        self.hits = 0
+        self.misses = 0
+        if cache_file:
+            self.load()
+
+    def load(self):
+        """
+        Read the saved resolutions if they belong to the same catalogue.
+        """
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data["fingerprint"] == self.fingerprint:
+                self.positions = dict(data["positions"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.positions = {}
+
+    def save(self):
+        """
+        Write the resolutions to the cache file atomically.
+        """
+        if not self.cache_file:
+            return
+        write_json_atomic(self.cache_file, {"fingerprint": self.fingerprint,
+                                            "positions": self.positions})
+
+    def find_similar_position(self, name):
+        """
+        Return ``CatalogueIndex.find_similar_position(name)``, memoized.
+        """
+        try:
+            position = self.positions[name]
+        except KeyError:
+            self.misses += 1
+            position = self.positions[name] = self.resolved[name] = \
+                self.index.find_similar_position(name)
+            return position
+        self.hits += 1
+        return position
+
+    def find_similar(self, name):
+        """
+        Return the first catalogue product similar to ``name``, or None.
+        """
+        position = self.find_similar_position(name)
+        return None if position is None else self.index.catalogue[position]
+
+    def find_exact(self, name):
+        """
+        Return the first product whose title equals ``name`` ignoring case.
+        """
+        return self.index.find_exact(name)
+
+    def absorb(self, resolved, hits, misses):
+        """
+        Add the resolutions and counters collected by another process.
+        """
+        self.positions.update(resolved)
+        self.resolved.update(resolved)
+        self.hits += hits
+        self.misses += misses
+
+    def summary(self):
+        """
+        Return a one-line description of the hit and miss counters.
+        """
+        return hit_rate_summary("Name cache", self.hits, self.misses)
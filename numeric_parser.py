@@ -0,0 +1,194 @@
+"""
+Bulk reader for files with one number per line.
+
+The file is read in large binary chunks and the lines of every chunk are
+converted in bulk with ``array.extend(map(float, lines))``.  Invalid lines
+and I/O errors are collected in a ``ParseReport`` instead of being printed
+as they occur.
+"""
+import os
+from array import array
+
+# Bytes read from disk per chunk
+CHUNK_SIZE = 1 << 20
+# Lines checked together by parsers that validate a slice before converting it
+SLICE_LINES = 4096
+# Invalid lines kept verbatim in a report; the rest are only counted
+MAX_RECORDED_LINES = 1000
+
+
+class ParseReport:
+    """
+    Diagnostics collected while parsing a numeric file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.lines = 0
+        self.values = 0
+        self.invalid_count = 0
+        self.invalid = []
+        self.error = None
+
+    def to_dict(self):
+        """
+        Return the report as a JSON-serializable dict.
+        """
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a report saved with ``to_dict``.
+        """
+        report = cls(data["file_path"])
+        report.__dict__.update(data)
+        report.invalid = [tuple(item) for item in report.invalid]
+        return report
+
+    def add_invalid(self, line_num, text):
+        """
+        Record a line that is not a number.
+        """
+        self.invalid_count += 1
+        if len(self.invalid) < MAX_RECORDED_LINES:
+            self.invalid.append(
+                (line_num, text.decode('utf-8', errors='replace')))
+
+    def print_summary(self, limit=10):
+        """
+        Print the error, if any, and up to ``limit`` invalid lines.
+        """
+        if self.error:
+            print(f"Error: {self.error}")
+        if not self.invalid_count:
+            return
+        print(f"Warning: {self.invalid_count} invalid line(s) skipped in "
+              f"'{self.file_path}':")
+        for line_num, text in self.invalid[:limit]:
+            print(f"  line {line_num}: '{text}'")
+        if self.invalid_count > limit:
+            print(f"  ... and {self.invalid_count - limit} more")
+
+    def merge(self, other, line_offset=0):
+        """
+        Add the diagnostics of another report.
+
+        ``line_offset`` is added to the other report's line numbers, which
+        is how a byte-range chunk's local numbering becomes file numbering.
+        """
+        self.lines += other.lines
+        self.values += other.values
+        self.invalid_count += other.invalid_count
+        room = MAX_RECORDED_LINES - len(self.invalid)
+        self.invalid.extend((line_num + line_offset, text)
+                            for line_num, text in other.invalid[:room])
+        self.error = self.error or other.error
+
+
+def convert_lines(lines, first_line, report):
+    """
+    Convert a list of byte lines to an ``array('d')``.
+
+    ``first_line`` is the line number of ``lines[0]``; it is used to report
+    invalid lines.  The lines are converted in bulk; a bad line is recorded
+    and bulk conversion resumes right after it.
+    """
+    report.lines += len(lines)
+    values = array('d')
+    remaining = iter(lines)
+    position = 0
+    while True:
+        converted = len(values)
+        try:
+            # array.extend keeps the values converted before a failure, so
+            # the count of new values locates the bad line, which the
+            # iterator has already consumed
+            values.extend(map(float, remaining))
+            break
+        except ValueError:
+            position += len(values) - converted
+            report.add_invalid(first_line + position,
+                               lines[position].rstrip(b'\r'))
+            position += 1
+    report.values += len(values)
+    return values
+
+
+def iter_blocks(file_path, report, chunk_size=CHUNK_SIZE, start=0, end=None,
+                convert=convert_lines):
+    """
+    Yield the numbers of a file as a sequence of ``array('d')`` blocks.
+
+    Only the bytes in ``[start, end)`` are read; ``start`` must be the
+    beginning of a line and line numbers in ``report`` count from it.
+    Open errors are stored in ``report.error`` and end the iteration.
+    Another ``convert(lines, first_line, report)`` function can be given
+    to parse lines that are not decimal numbers.
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            remaining = float('inf') if end is None else end - start
+            pending = b''
+            next_line = 1
+            while remaining > 0:
+                chunk = file.read(int(min(chunk_size, remaining)))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                chunk = pending + chunk
+                cut = chunk.rfind(b'\n')
+                if cut < 0:
+                    pending = chunk
+                    continue
+                pending = chunk[cut + 1:]
+                lines = chunk[:cut].split(b'\n')
+                yield convert(lines, next_line, report)
+                next_line += len(lines)
+            if pending:
+                yield convert([pending], next_line, report)
+    except FileNotFoundError:
+        report.error = f"File '{file_path}' not found."
+    except PermissionError:
+        report.error = f"Permission denied for file '{file_path}'."
+    except OSError as e:
+        report.error = f"Could not read '{file_path}': {e}"
+
+
+def split_byte_ranges(file_path, parts):
+    """
+    Split a file into at most ``parts`` byte ranges that start on a line.
+
+    Returns:
+        list: (start, end) pairs covering the whole file in order.
+    """
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as file:
+        for i in range(1, parts):
+            position = size * i // parts
+            if position <= bounds[-1]:
+                continue
+            # Move to the start of the next line
+            file.seek(position - 1)
+            file.readline()
+            position = file.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def parse_numeric_file(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Read a whole numeric file.
+
+    Returns:
+        tuple: (array('d') of the numbers, ParseReport)
+    """
+    report = ParseReport(file_path)
+    values = array('d')
+    for block in iter_blocks(file_path, report, chunk_size):
+        values.extend(block)
+    return values, report
@@ -0,0 +1,71 @@
+"""
+Vectorized descriptive statistics on NumPy float64 arrays.
+
+NumPy is optional: check ``HAVE_NUMPY`` before calling anything here.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from numeric_parser import parse_numeric_file
+
+HAVE_NUMPY = np is not None
+
+
+def read_array(file_path):
+    """
+    Read a file with one number per line straight into a float64 array.
+
+    Returns:
+        tuple: (float64 array, ParseReport)
+    """
+    values, report = parse_numeric_file(file_path)
+    return np.frombuffer(values, dtype=np.float64), report
+
+
+def compute_statistics(array):
+    """
+    Compute descriptive statistics of a float64 array.
+
+    Returns:
+        tuple: (mean, median, mode, standard_deviation, variance), with
+        every item None if the array is empty.
+    """
+    n = array.size
+    if not n:
+        return None, None, None, None, None
+
+    # Pairwise sum, then one correction pass for what rounding left behind
+    mean = float(array.sum()) / n
+    if not math.isfinite(mean) and np.isfinite(array).all():
+        # The total exceeds the float range; divide each value first
+        mean = float((array / n).sum())
+    deviations = array - mean
+    correction = float(deviations.sum()) / n
+    mean += correction
+    deviations -= correction
+
+    if n % 2 == 0:
+        middle = np.partition(array, (n // 2 - 1, n // 2))
+        median = (float(middle[n // 2 - 1]) + float(middle[n // 2])) / 2
+    else:
+        median = float(np.partition(array, n // 2)[n // 2])
+
+    # Break ties like the pure Python backend: first value seen wins
+    values, first_index, counts = np.unique(
+        array, return_index=True, return_counts=True)
+    tied = counts == counts.max()
+    mode = float(values[tied][np.argmin(first_index[tied])])
+
+    # Scale before squaring so values near the float limit cannot overflow
+    scale = float(np.abs(deviations).max())
+    if scale and math.isfinite(scale):
+        scaled = deviations / scale
+        m2 = float(np.dot(scaled, scaled)) - float(scaled.sum()) ** 2 / n
+        variance = m2 * scale * scale / n
+    else:
+        variance = scale
+    return mean, median, mode, math.sqrt(variance), variance
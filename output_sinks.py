@@ -0,0 +1,216 @@
+"""
+Output sinks that stream conversion results row by row.
+
+Every sink encodes its rows into one preallocated ``bytearray`` and
+writes it out through a ``memoryview`` whenever it fills up, so no text
+block of the whole file is ever built.  A row holds a number in decimal,
+binary and hexadecimal; with a fixed width the binary and hexadecimal
+columns are that many bits in two's complement.
+
+Formats:
+    text    "decimal binary hex" per line
+    csv     header row, then decimal,binary,hex columns
+    jsonl   one {"decimal": ..., "binary": ..., "hex": ...} object per line
+    binary  packed little-endian records, see ``PackedSink``
+"""
+import struct
+from abc import ABC, abstractmethod
+
+from fixed_width import WIDTHS
+
+# Size of the reused output buffer
+BUFFER_SIZE = 1 << 20
+# Rows a text sink formats into one block before copying it to the buffer
+TEXT_BLOCK_ROWS = 4096
+
+
+class OutputSink(ABC):
+    """
+    Base class: buffered binary writer for rows of integers.
+
+    Subclasses implement ``encode_rows`` and may override ``header``.
+    """
+
+    extension = ".txt"
+
+    def __init__(self, file_path, width=None, buffer_size=BUFFER_SIZE):
+        self.file_path = file_path
+        self.width = width
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.position = 0
+        self.rows = 0
+        self.file = open(file_path, 'wb')
+        self.put(self.header())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def header(self):
+        """
+        Return the bytes written before the first row.
+        """
+        return b""
+
+    def formatters(self):
+        """
+        Return the functions turning an int into binary and hex text.
+        """
+        if not self.width:
+            return bin, hex
+        mask = (1 << self.width) - 1
+        binary_format = f"0b{{:0{self.width}b}}".format
+        hex_format = f"0x{{:0{self.width // 4}x}}".format
+        return (lambda value: binary_format(value & mask),
+                lambda value: hex_format(value & mask))
+
+    def put(self, data):
+        """
+        Copy ``data`` into the buffer, flushing it first if it is full.
+        """
+        size = len(data)
+        end = self.position + size
+        if end > len(self.buffer):
+            self.flush()
+            if size > len(self.buffer):
+                self.file.write(data)
+                return
+            end = size
+        self.buffer[self.position:end] = data
+        self.position = end
+
+    def flush(self):
+        """
+        Write the filled part of the buffer to the file.
+        """
+        if self.position:
+            self.file.write(self.view[:self.position])
+            self.position = 0
+
+    def write_rows(self, integers):
+        """
+        Encode and buffer one row per integer.
+        """
+        self.encode_rows(integers)
+        self.rows += len(integers)
+
+    @abstractmethod
+    def encode_rows(self, integers):
+        """
+        Buffer the encoded rows; implemented by each format.
+        """
+
+    def close(self):
+        """
+        Flush the buffer and close the file.
+        """
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+            self.view.release()
+
+
+class TextSink(OutputSink):
+    """
+    Plain text: "decimal binary hex" on each line.
+    """
+
+    row_format = "%d %s %s\n"
+
+    def encode_rows(self, integers):
+        # Rows are formatted a block at a time, so there is one text
+        # object and one copy into the buffer per block, not per row
+        to_binary, to_hex = self.formatters()
+        row_format = self.row_format
+        for start in range(0, len(integers), TEXT_BLOCK_ROWS):
+            self.put("".join([
+                row_format % (value, to_binary(value), to_hex(value))
+                for value in integers[start:start + TEXT_BLOCK_ROWS]
+            ]).encode('ascii'))
+
+
+class CsvSink(TextSink):
+    """
+    CSV with decimal, binary and hex columns.
+    """
+
+    extension = ".csv"
+    row_format = "%d,%s,%s\n"
+
+    def header(self):
+        return b"decimal,binary,hex\n"
+
+
+class JsonLinesSink(TextSink):
+    """
+    JSON Lines: one object per number.
+
+    The values are plain digits, so the objects are formatted directly
+    rather than through ``json.dumps``.
+    """
+
+    extension = ".jsonl"
+    row_format = '{"decimal": %d, "binary": "%s", "hex": "%s"}\n'
+
+
+class PackedSink(OutputSink):
+    """
+    Packed binary records.
+
+    The file starts with the 8-byte magic ``b"CONVNUM1"`` and one byte
+    holding the record width in bits (64 unless a width is given).  Each
+    record is the number in that many bits of little-endian two's
+    complement, so a reader recovers binary and hex from the integer.
+    Callers must reject values that do not fit, see
+    ``fixed_width.split_accepted``.
+    """
+
+    extension = ".bin"
+    MAGIC = b"CONVNUM1"
+    RECORD_FORMATS = {8: 'B', 16: 'H', 32: 'I', 64: 'Q'}
+
+    def __init__(self, file_path, width=None, buffer_size=BUFFER_SIZE):
+        width = width or 64
+        if width not in WIDTHS:
+            raise ValueError(f"width must be one of {WIDTHS}, not {width}")
+        self.record = struct.Struct('<' + self.RECORD_FORMATS[width])
+        super().__init__(file_path, width, buffer_size)
+
+    def header(self):
+        return self.MAGIC + bytes([self.width])
+
+    def encode_rows(self, integers):
+        # Records are packed straight into the buffer
+        mask = (1 << self.width) - 1
+        size = self.record.size
+        capacity = len(self.buffer)
+        pack_into = self.record.pack_into
+        for value in integers:
+            if self.position + size > capacity:
+                self.flush()
+            pack_into(self.buffer, self.position, value & mask)
+            self.position += size
+
+
+SINKS = {
+    "text": TextSink,
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "binary": PackedSink,
+}
+
+
+def open_sink(output_format, file_path=None, width=None):
+    """
+    Open the sink for ``output_format``.
+
+    Without ``file_path`` the results go to ConversionResults with the
+    format's extension.
+    """
+    sink_class = SINKS[output_format]
+    if file_path is None:
+        file_path = "ConversionResults" + sink_class.extension
+    return sink_class(file_path, width)
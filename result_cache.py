@@ -0,0 +1,99 @@
+"""
+On-disk cache of statistics results keyed by file content.
+
+Entries are keyed by the SHA-256 of the input plus the options used to
+compute them.  A file whose size and modification time are unchanged
+since it was last hashed is not hashed again.  The least recently used
+entries are evicted once the cache holds more than ``max_entries``.
+"""
+import json
+import os
+from collections import OrderedDict
+
+from cache_utils import hash_file, write_json_atomic
+
+DEFAULT_CACHE_FILE = '.statistics_cache.json'
+DEFAULT_CACHE_SIZE = 256
+
+
+class ResultCache:
+    """
+    LRU cache of per-file results persisted as JSON.
+    """
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE,
+                 max_entries=DEFAULT_CACHE_SIZE):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.files = OrderedDict()
+        self.entries = OrderedDict()
+        self.load()
+
+    def load(self):
+        """
+        Read the cache file; a missing or corrupt file gives an empty cache.
+        """
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            self.files = OrderedDict(data["files"])
+            self.entries = OrderedDict(data["entries"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.files = OrderedDict()
+            self.entries = OrderedDict()
+
+    def save(self):
+        """
+        Write the cache file atomically.
+        """
+        write_json_atomic(self.cache_file,
+                          {"files": self.files, "entries": self.entries})
+
+    def content_hash(self, file_path):
+        """
+        Return the content hash of a file, reusing the stored hash when the
+        size and modification time have not changed.
+        """
+        status = os.stat(file_path)
+        path = os.path.abspath(file_path)
+        known = self.files.get(path)
+        if known and known["size"] == status.st_size \
+                and known["mtime_ns"] == status.st_mtime_ns:
+            self.files.move_to_end(path)
+            return known["sha256"]
+
+        digest = hash_file(file_path)
+        self.files[path] = {"size": status.st_size,
+                            "mtime_ns": status.st_mtime_ns,
+                            "sha256": digest}
+        self.files.move_to_end(path)
+        while len(self.files) > self.max_entries:
+            self.files.popitem(last=False)
+        return digest
+
+    def key(self, file_path, options):
+        """
+        Return the cache key for a file and the options used on it.
+
+        Raises OSError if the file cannot be read.
+        """
+        return self.content_hash(file_path) + ":" + json.dumps(
+            options, sort_keys=True)
+
+    def get(self, key):
+        """
+        Return the cached value for a key, or None on a miss.
+        """
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Store a JSON-serializable value and evict the oldest entries.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
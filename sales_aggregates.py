@@ -0,0 +1,124 @@
+"""
+Grouped sales totals collected while the sales are priced.
+
+``SalesAggregates`` keeps totals per SALE_ID, SALE_Date, catalogue product
+and catalogue type.  Each grouping is a ``GroupTotals``: a dict from key
+to row number plus typed arrays of amounts and record counts, and a list
+of quantities, which stay exact integers unless a sale has a fractional
+quantity.  Aggregates of separate partitions merge into the same result as
+a single pass, with groups in first-seen order.
+"""
+from array import array
+
+GROUPINGS = (
+    ("sale", "SALE_ID"),
+    ("date", "SALE_Date"),
+    ("product", "Product"),
+    ("type", "Type"),
+)
+
+
+def format_quantity(quantity):
+    """
+    Return an integer quantity in full and a fractional one in short form.
+    """
+    if isinstance(quantity, int):
+        return str(quantity)
+    return f"{quantity:.15g}"
+
+
+class GroupTotals:
+    """
+    Amount, quantity and record count for every key of one grouping.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.amounts = array('d')
+        self.quantities = []
+        self.records = array('q')
+
+    def add(self, key, amount, quantity, records=1):
+        """
+        Add a priced sale (or a partial group) to the group of ``key``.
+        """
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.amounts)
+            self.amounts.append(0.0)
+            self.quantities.append(0)
+            self.records.append(0)
+        self.amounts[row] += amount
+        self.quantities[row] += quantity
+        self.records[row] += records
+
+    def merge(self, other):
+        """
+        Add the groups of another ``GroupTotals``.
+        """
+        for key, row in other.rows.items():
+            self.add(key, other.amounts[row], other.quantities[row],
+                     other.records[row])
+
+    def items(self):
+        """
+        Yield (key, records, quantity, amount) in first-seen key order.
+        """
+        for key, row in self.rows.items():
+            yield key, self.records[row], self.quantities[row], \
+                self.amounts[row]
+
+
+class SalesAggregates:
+    """
+    Totals of priced sales by SALE_ID, SALE_Date, product and type.
+    """
+
+    def __init__(self):
+        self.groups = {name: GroupTotals() for name, _ in GROUPINGS}
+
+    def add(self, sale, catalog_product, amount):
+        """
+        Record a sale priced at ``amount`` with ``catalog_product``.
+        """
+        quantity = sale["Quantity"]
+        self.groups["sale"].add(sale.get("SALE_ID"), amount, quantity)
+        self.groups["date"].add(sale.get("SALE_Date"), amount, quantity)
+        self.groups["product"].add(catalog_product["title"], amount, quantity)
+        self.groups["type"].add(catalog_product.get("type"), amount, quantity)
+
+    def merge(self, other):
+        """
+        Add the totals of another ``SalesAggregates``, e.g. a partition.
+        """
+        for name, groups in self.groups.items():
+            groups.merge(other.groups[name])
+
+    def write_report(self, report_file, sale_groups=None):
+        """
+        Write every grouping as a tab-separated table.
+
+        Args:
+            report_file: Open text file to write to.
+            sale_groups (list): Optional (file name, SalesAggregates)
+                pairs; the SALE_ID table then lists each file's sales
+                separately, since sale IDs repeat between files.
+        """
+        for name, label in GROUPINGS:
+            report_file.write(f"Sales by {label}\n")
+            if name == "sale" and sale_groups:
+                report_file.write("File\tSALE_ID\tRecords\tQuantity\tTotal\n")
+                for file_name, aggregates in sale_groups:
+                    for key, records, quantity, amount in \
+                            aggregates.groups["sale"].items():
+                        report_file.write(f"{file_name}\t{key}\t{records}\t"
+                                          f"{format_quantity(quantity)}\t"
+                                          f"{amount:.2f}\n")
+            else:
+                report_file.write(f"{label}\tRecords\tQuantity\tTotal\n")
+                for key, records, quantity, amount in \
+                        self.groups[name].items():
+                    report_file.write(f"{key}\t{records}\t"
+                                      f"{format_quantity(quantity)}\t"
+                                      f"{amount:.2f}\n")
+            report_file.write("\n")
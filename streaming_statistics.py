@@ -0,0 +1,308 @@
+"""
+Single-pass accumulators for descriptive statistics over a stream of numbers.
+"""
+import math
+from array import array
+
+from accurate_sums import accurate_moments
+from frequency_table import FrequencyTable
+
+# Number of values kept in memory before the median switches to the sketch
+DEFAULT_EXACT_LIMIT = 100000
+# Capacity of each compactor level in the quantile sketch
+DEFAULT_SKETCH_SIZE = 256
+
+
+class RunningStatistics:
+    """
+    Running count, mean and sum of squared deviations (Welford's method).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value):
+        """
+        Add one value to the running aggregates.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update_many(self, values):
+        """
+        Add a block of values, reducing it first and then merging it.
+        """
+        self.merge_moments(*accurate_moments(values))
+
+    def merge(self, other):
+        """
+        Combine the aggregates of another ``RunningStatistics`` into this one.
+        """
+        self.merge_moments(other.count, other.mean, other.m2)
+
+    def merge_moments(self, count, mean, m2):
+        """
+        Merge a partial (count, mean, M2) with Chan's parallel formula.
+
+        The weights are divided out before they multiply ``delta``, so an
+        intermediate product only overflows when the result does.
+        """
+        if not count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = count, mean, m2
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        if math.isinf(delta) and math.isfinite(self.mean) \
+                and math.isfinite(mean):
+            # Means of opposite sign near the float limit: weigh each one
+            self.mean = self.mean * (self.count / total) \
+                + mean * (count / total)
+        else:
+            self.mean += delta * (count / total)
+        self.m2 += m2 + delta * (delta * (self.count * count / total))
+        self.count = total
+
+    def to_dict(self):
+        """
+        Return the aggregates as a JSON-serializable dict.
+        """
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild aggregates saved with ``to_dict``.
+        """
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = \
+            data["count"], data["mean"], data["m2"]
+        return stats
+
+    def variance(self):
+        """
+        Return the population variance, or None if no value was seen.
+        """
+        return self.m2 / self.count if self.count else None
+
+    def standard_deviation(self):
+        """
+        Return the population standard deviation, or None if no value was seen.
+        """
+        variance = self.variance()
+        return math.sqrt(variance) if variance is not None else None
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles in bounded memory using a stack of compactors.
+
+    Level ``h`` stores values that stand for ``2 ** h`` original values.
+    When a level fills up it is sorted and every other value is promoted
+    to the next level.  Until the first compaction the sketch is exact;
+    afterwards the rank error is about ``n * log2(n / k) / k``.
+    """
+
+    def __init__(self, k=DEFAULT_SKETCH_SIZE):
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self._offset = 0
+
+    def update_many(self, values):
+        """
+        Add a block of values to the sketch.
+        """
+        self.count += len(values)
+        self.levels[0].extend(values)
+        if len(self.levels[0]) >= self.k:
+            self._compress()
+
+    def merge(self, other):
+        """
+        Add the contents of another sketch to this one.
+        """
+        self.count += other.count
+        for height, level in enumerate(other.levels):
+            if height == len(self.levels):
+                self.levels.append([])
+            self.levels[height].extend(level)
+        self._compress()
+
+    def to_dict(self):
+        """
+        Return the sketch as a JSON-serializable dict.
+        """
+        return {"k": self.k, "count": self.count, "levels": self.levels,
+                "offset": self._offset}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a sketch saved with ``to_dict``.
+        """
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [list(level) for level in data["levels"]]
+        sketch._offset = data["offset"]
+        return sketch
+
+    def _compress(self):
+        """
+        Halve every full level, promoting the survivors one level up.
+        """
+        for height, level in enumerate(self.levels):
+            if len(level) < self.k:
+                continue
+            if height + 1 == len(self.levels):
+                self.levels.append([])
+            level.sort()
+            # An odd value out stays behind so no weight is lost
+            leftover = [level.pop()] if len(level) % 2 else []
+            self.levels[height + 1].extend(level[self._offset::2])
+            # Alternate the surviving half so the error does not drift
+            self._offset = 1 - self._offset
+            self.levels[height] = leftover
+
+    def value_at_rank(self, rank):
+        """
+        Return the value whose zero-based rank is approximately ``rank``.
+        """
+        weighted = sorted(
+            (value, 1 << height)
+            for height, level in enumerate(self.levels)
+            for value in level
+        )
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen > rank:
+                return value
+        return weighted[-1][0] if weighted else None
+
+    def median(self):
+        """
+        Return the (approximate) median, or None if no value was seen.
+        """
+        n = self.count
+        if not n:
+            return None
+        if n % 2 == 0:
+            return (self.value_at_rank(n // 2 - 1)
+                    + self.value_at_rank(n // 2)) / 2
+        return self.value_at_rank(n // 2)
+
+
+def exact_median(data):
+    """
+    Return the median of a list of numbers by sorting it.
+    """
+    sorted_data = sorted(data)
+    n = len(sorted_data)
+    if n % 2 == 0:
+        return (sorted_data[n // 2 - 1] + sorted_data[n // 2]) / 2
+    return sorted_data[n // 2]
+
+
+class StatisticsAccumulator:
+    """
+    Mergeable aggregates behind the streaming statistics.
+
+    Mean, variance and standard deviation come from a ``RunningStatistics``
+    and the mode from a ``FrequencyTable``.  Values are buffered for an
+    exact median until more than ``exact_limit`` have been seen; then the
+    buffer is poured into a ``QuantileSketch``.
+    """
+
+    def __init__(self, exact_limit=DEFAULT_EXACT_LIMIT):
+        self.exact_limit = exact_limit
+        self.stats = RunningStatistics()
+        self.frequency = FrequencyTable()
+        self.buffer = array('d')
+        self.sketch = None
+
+    def update_many(self, values):
+        """
+        Add a block of values.
+        """
+        self.stats.update_many(values)
+        self.frequency.update(values)
+        if self.sketch is not None:
+            self.sketch.update_many(values)
+            return
+        self.buffer.extend(values)
+        if len(self.buffer) > self.exact_limit:
+            self._spill()
+
+    def _spill(self):
+        """
+        Move the exact buffer into a quantile sketch.
+        """
+        self.sketch = QuantileSketch()
+        self.sketch.update_many(self.buffer)
+        self.buffer = None
+
+    def merge(self, other):
+        """
+        Combine the aggregates of another accumulator into this one.
+        """
+        self.stats.merge(other.stats)
+        self.frequency.merge(other.frequency)
+        if (self.sketch is None and other.sketch is None
+                and len(self.buffer) + len(other.buffer) <= self.exact_limit):
+            self.buffer.extend(other.buffer)
+            return
+        if self.sketch is None:
+            self._spill()
+        if other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        else:
+            self.sketch.update_many(other.buffer)
+
+    def to_dict(self):
+        """
+        Return the aggregates as a JSON-serializable dict.
+        """
+        return {
+            "exact_limit": self.exact_limit,
+            "stats": self.stats.to_dict(),
+            "frequency": self.frequency.to_list(),
+            "buffer": None if self.buffer is None else self.buffer.tolist(),
+            "sketch": None if self.sketch is None else self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild aggregates saved with ``to_dict``.
+        """
+        accumulator = cls(data["exact_limit"])
+        accumulator.stats = RunningStatistics.from_dict(data["stats"])
+        accumulator.frequency = FrequencyTable.from_list(data["frequency"])
+        if data["sketch"] is not None:
+            accumulator.buffer = None
+            accumulator.sketch = QuantileSketch.from_dict(data["sketch"])
+        else:
+            accumulator.buffer = array('d', data["buffer"])
+        return accumulator
+
+    def results(self):
+        """
+        Return (mean, median, mode, standard_deviation, variance), with
+        every item None if no value was added.
+        """
+        stats = self.stats
+        if not stats.count:
+            return None, None, None, None, None
+        if self.sketch is None:
+            median = exact_median(self.buffer)
+        else:
+            median = self.sketch.median()
+        return (stats.mean, median, self.frequency.mode(),
+                stats.standard_deviation(), stats.variance())
+
@@ -2,31 +2,28 @@
 Read the file and return the number of times that a word has
 been mentioned.
 """
-import sys
+import argparse
 import time
 import math
 
+import numpy_backend
+from accurate_sums import accurate_mean, accurate_variance
+from frequency_table import FrequencyTable
+from numeric_parser import parse_numeric_file
+
 def read_file(file_path):
     """
-    Read the file and return a list of numbers.
+    Read the file and return an array of numbers.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            # pylint: disable=W1514
-            data = [float(line.strip()) for line in file]
-            return data
-    except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.")
-        return []
-    except ValueError:
-        print("Error: Invalid data found in the file.")
-        return []
+    data, report = parse_numeric_file(file_path)
+    report.print_summary()
+    return data
 
 def compute_mean(data):
     """
     Calculate the mean of the given list of numbers.
     """
-    return sum(data) / len(data) if data else None
+    return accurate_mean(data)
 
 def compute_median(data):
     """
@@ -46,12 +43,7 @@ def compute_mode(data):
     if not data:
         return None
 
-    frequency = {}
-    for num in data:
-        frequency[num] = frequency.get(num, 0) + 1
-
-    mode = [k for k, v in frequency.items() if v == max(frequency.values())]
-    return mode[0] if mode else None
+    return FrequencyTable.from_values(data).mode()
 
 def compute_standard_deviation(data, mean):
     """
@@ -60,8 +52,7 @@ def compute_standard_deviation(data, mean):
     if not data:
         return None
 
-    variance = sum((x - mean) ** 2 for x in data) / len(data)
-    return math.sqrt(variance)
+    return math.sqrt(accurate_variance(data, mean))
 
 def compute_variance(data, mean):
     """
@@ -70,29 +61,45 @@ def compute_variance(data, mean):
     if not data:
         return None
 
-    return sum((x - mean) ** 2 for x in data) / len(data)
+    return accurate_variance(data, mean)
 
 def main():
     """
     Main function to compute descriptive statistics.
     """
-    if len(sys.argv) != 2:
-        print("Usage: python computeStatistics.py fileWithData.txt")
-        return
-
-    file_path = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Compute descriptive statistics for a file of numbers.")
+    parser.add_argument("file_path", help="file with one number per line")
+    parser.add_argument("--backend", choices=("python", "numpy"),
+                        default="python",
+                        help="implementation used for the statistics "
+                             "(default: %(default)s)")
+    args = parser.parse_args()
+
+    backend = args.backend
+    if backend == "numpy" and not numpy_backend.HAVE_NUMPY:
+        print("Warning: NumPy is not installed, using the python backend.")
+        backend = "python"
 
     start_time = time.time()
 
-    data = read_file(file_path)
-    if not data:
-        return
-
-    mean = compute_mean(data)
-    median = compute_median(data)
-    mode = compute_mode(data)
-    standard_deviation = compute_standard_deviation(data, mean)
-    variance = compute_variance(data, mean)
+    if backend == "numpy":
+        array, report = numpy_backend.read_array(args.file_path)
+        report.print_summary()
+        if not array.size:
+            return
+        mean, median, mode, standard_deviation, variance = \
+            numpy_backend.compute_statistics(array)
+    else:
+        data = read_file(args.file_path)
+        if not data:
+            return
+
+        mean = compute_mean(data)
+        median = compute_median(data)
+        mode = compute_mode(data)
+        standard_deviation = compute_standard_deviation(data, mean)
+        variance = compute_variance(data, mean)
 
     end_time = time.time()
     elapsed_time = end_time - start_time